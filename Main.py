@@ -1,40 +1,60 @@
+import time
+
 import streamlit as st
 import yfinance as yf
 import pandas as pd
-import plotly.graph_objects as go
 import plotly.express as px
-import json
-import os
+
+from services.watchlist import load_watchlist, save_watchlist
+from services.alignment import align_prices
+from services.patterns import PATTERNS
+from services.bar_store import REFRESH_SECONDS, load_bars
+from services.corporate_actions import dividends_series, splits_series
+from services.quote_stream import QuoteStream
+from services.http_client import metrics as http_metrics, yf_session
+from services.task_graph import TaskGraph
+from services.memory_budget import memory, session_get, session_id
+from components.charts import CHART_PATTERNS, price_chart_with_overlays
+from components.figure_cache import figure_cache
+from components.data_table import paged_table
 
 st.set_page_config(page_title="Global Market Dashboard", layout="wide")
 
 st.title("Global Market Dashboard")
 st.markdown("Live overview of U.S., global, and crypto markets.")
 
-WATCHLIST_FILE = "watchlist.json"
+# ============================
+# MEMORY USAGE
+# ============================
+with st.sidebar.expander("Memory usage"):
+    mem = memory.stats()
+    figs = figure_cache.stats()
+    session_bytes = memory.usage().get(session_id(), 0)
+    st.caption(
+        f"This session: {session_bytes / 2 ** 20:.1f} MB of {mem['session_bytes'] / 2 ** 20:.0f} MB  \n"
+        f"All sessions: {mem['bytes'] / 2 ** 20:.1f} MB of {mem['max_bytes'] / 2 ** 20:.0f} MB  \n"
+        f"Shared figures: {figs['bytes'] / 2 ** 20:.1f} MB  \n"
+        f"Reloads: {mem['reloads']}, evictions: {mem['evictions']}"
+    )
+    objects = memory.objects(session_id())
+    if objects:
+        paged_table(pd.DataFrame(objects).drop(columns="session"), key="memory_table", controls=False)
+
+with st.sidebar.expander("Network"):
+    net = http_metrics()
+    reuse = f"{net['connection_reuse']:.0%}" if net["connection_reuse"] is not None else "n/a"
+    hit_ratio = f"{net['cache_hit_ratio']:.0%}" if net["cache_hit_ratio"] is not None else "n/a"
+    st.caption(
+        f"Requests: {net['requests']}, to network: {net['network']}  \n"
+        f"Connection reuse: {reuse}  \n"
+        f"Cache hit ratio: {hit_ratio} (revalidated {net['revalidated']}, stale {net['stale_served']})  \n"
+        f"Errors: {net['errors']}"
+    )
 
 
 # ============================
 # WATCHLIST PERSISTENCE
 # ============================
-def load_watchlist():
-    if not os.path.exists(WATCHLIST_FILE):
-        return []
-    try:
-        with open(WATCHLIST_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return []
-
-
-def save_watchlist(watchlist):
-    try:
-        with open(WATCHLIST_FILE, "w", encoding="utf-8") as f:
-            json.dump(watchlist, f, indent=2)
-    except Exception:
-        pass
-
-
 if "watchlist" not in st.session_state:
     st.session_state.watchlist = load_watchlist()
 
@@ -50,15 +70,15 @@ with col_left:
     if st.button("Add to watchlist"):
         sym = new_ticker.strip().upper()
         if sym:
-            entry = {"name": sym, "ticker": sym}
-            if entry not in st.session_state.watchlist:
+            entry = {"name": sym, "ticker": sym, "weight": 1.0}
+            if all(e.get("ticker") != sym for e in st.session_state.watchlist):
                 st.session_state.watchlist.append(entry)
                 save_watchlist(st.session_state.watchlist)
 
 with col_right:
     if st.session_state.watchlist:
         df_watch = pd.DataFrame(st.session_state.watchlist)
-        st.dataframe(df_watch, use_container_width=True)
+        paged_table(df_watch, key="watchlist_table", controls=False, use_container_width=True)
     else:
         st.info("Watchlist is empty.")
 
@@ -86,58 +106,83 @@ CRYPTO_TICKERS = {
     "Ethereum": "ETH-USD",
 }
 
+# Overview boxes redraw at most once per frame while quotes are moving; after
+# IDLE_AFTER seconds without a tick they check only every IDLE_SECONDS
+FRAME_SECONDS = 1.0
+IDLE_SECONDS = 15.0
+IDLE_AFTER = 10.0
+
+
+@st.cache_resource
+def get_quote_stream():
+    # One push feed per server process, shared by every session
+    return QuoteStream()
 
-def get_ticker_data(ticker: str):
-    df = yf.download(
-        ticker, period="5d", interval="1d", auto_adjust=True, progress=False
-    )
-    if df.empty or len(df) < 2:
-        return None, None
 
-    close = df["Close"]
-    last = float(close.iloc[-1])
-    prev = float(close.iloc[-2])
-    pct = (last - prev) / prev * 100
-    return last, pct
+quote_stream = get_quote_stream().subscribe(list(INDEX_TICKERS.values()) + list(CRYPTO_TICKERS.values()))
 
 
 st.subheader("Market Overview")
 
 
-def render_boxes(ticker_dict, title: str):
+def box_html(name, quote):
+    pct = quote["pct"] or 0.0
+    color = "#00cc66" if pct >= 0 else "#ff4444"
+    return f"""
+        <div style="
+            padding:15px;
+            border-radius:14px;
+            background:linear-gradient(135deg,#141414,#101820);
+            border:1px solid #333333;
+            box-shadow:0 4px 16px rgba(0,0,0,0.4);
+        ">
+            <h4 style="margin:0; color:white; font-weight:600;">{name}</h4>
+            <p style="margin:4px 0 0 0; color:{color}; font-size:22px; font-weight:600;">
+                {pct:.2f}% today
+            </p>
+            <p style="margin:2px 0 0 0; color:#aaaaaa; font-size:13px;">
+                Last: {quote["last"]:.2f}
+            </p>
+        </div>
+        """
+
+
+def _boxes(ticker_dict, title):
+    # Only this fragment reruns on each frame, not the page. Box HTML is
+    # rebuilt only for quotes that changed since this session last drew them.
+    drawn = st.session_state.setdefault(
+        f"quote_boxes:{title}", {"version": 0, "html": {}, "last_tick": time.time(), "idle": False}
+    )
+    version, changed = quote_stream.board.changes(drawn["version"], ticker_dict.values())
+    for name, ticker in ticker_dict.items():
+        if ticker in changed:
+            drawn["html"][ticker] = box_html(name, changed[ticker])
+    drawn["version"] = version
+
+    # Switch the frame rate when the feed goes quiet (closed market) or
+    # wakes up; the new interval takes effect on the page rerun
+    if changed:
+        drawn["last_tick"] = time.time()
+    idle = time.time() - drawn["last_tick"] > IDLE_AFTER
+    if idle != drawn["idle"]:
+        drawn["idle"] = idle
+        st.rerun()
+
     st.markdown(f"## {title}")
     cols = st.columns(3)
 
     for idx, (name, ticker) in enumerate(ticker_dict.items()):
-        last, pct = get_ticker_data(ticker)
         col = cols[idx % 3]
-
-        if last is None:
-            col.markdown(f"**{name}**  \nData unavailable")
+        html = drawn["html"].get(ticker)
+        if html is None:
+            col.markdown(f"**{name}**  \nWaiting for quotes...")
             continue
+        col.markdown(html, unsafe_allow_html=True)
+
 
-        color = "#00cc66" if pct >= 0 else "#ff4444"
-
-        col.markdown(
-            f"""
-            <div style="
-                padding:15px;
-                border-radius:14px;
-                background:linear-gradient(135deg,#141414,#101820);
-                border:1px solid #333333;
-                box-shadow:0 4px 16px rgba(0,0,0,0.4);
-            ">
-                <h4 style="margin:0; color:white; font-weight:600;">{name}</h4>
-                <p style="margin:4px 0 0 0; color:{color}; font-size:22px; font-weight:600;">
-                    {pct:.2f}% today
-                </p>
-                <p style="margin:2px 0 0 0; color:#aaaaaa; font-size:13px;">
-                    Last close: {last:.2f}
-                </p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+def render_boxes(ticker_dict, title):
+    idle = st.session_state.get(f"quote_boxes:{title}", {}).get("idle", False)
+    st.fragment(run_every=IDLE_SECONDS if idle else FRAME_SECONDS)(_boxes)(ticker_dict, title)
 
 
 render_boxes(INDEX_TICKERS, "Global Stock Indices")
@@ -182,82 +227,65 @@ period_mapping = {
     "MAX": "max",
 }
 
-# Fetch clean data
-df = yf.download(
-    selected_ticker,
-    period=period_mapping[period_option],
-    interval="1d",
-    auto_adjust=False,
-    progress=False,
-)
+# Split-adjusted bars derived from the local raw-bar store, held (losslessly
+# compacted) in the session's memory budget and reloaded from the store if evicted
+def _overview_bars(ticker, period):
+    return load_bars(ticker, period=period, adjust="split").dropna(subset=["Close"])
+
+try:
+    df = session_get(
+        f"overview:{selected_ticker}:{period_mapping[period_option]}",
+        lambda: _overview_bars(selected_ticker, period_mapping[period_option]),
+        ttl=REFRESH_SECONDS,
+        compact=True,
+    )
+except Exception:
+    df = pd.DataFrame()
 
 if df.empty:
     st.warning("No market data available.")
     st.stop()
 
-# Clean index and remove timezone noise
-df.index = pd.to_datetime(df.index, errors="coerce")
-# pandas tz_localize compatibility
-try:
-    df.index = df.index.tz_localize(None, errors="ignore")
-except TypeError:
-    if getattr(df.index, "tz", None) is not None:
-        df.index = df.index.tz_localize(None)
-
-df = df.sort_index()
-
-# Normalize columns in case yf.download returned a MultiIndex or different casing
-if isinstance(df.columns, pd.MultiIndex):
-    df.columns = [col[0] for col in df.columns]
-
-if "Close" not in df.columns:
-    # try case-insensitive match or substring
-    cols_lower = {c.lower(): c for c in df.columns}
-    if "close" in cols_lower:
-        df.rename(columns={cols_lower["close"]: "Close"}, inplace=True)
-    else:
-        found = None
-        for c in df.columns:
-            if "close" in str(c).lower():
-                found = c
-                break
-        if found:
-            df.rename(columns={found: "Close"}, inplace=True)
-
-if "Close" not in df.columns:
-    st.warning("Downloaded data does not contain a Close column. Cannot render chart.")
-    st.stop()
-
-df = df.dropna(subset=["Close"])
-
 # Chart choice
 chart_type = st.radio("Chart type", ["Line", "Candlestick"], horizontal=True)
 
-# Draw chart
-fig = go.Figure()
-
-if chart_type == "Line":
-    fig.add_trace(go.Scatter(
-        x=df.index,
-        y=df["Close"],
-        mode="lines",
-        name=selected_market
-    ))
-else:
-    fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df["Open"],
-        high=df["High"],
-        low=df["Low"],
-        close=df["Close"],
-        increasing_line_color="green",
-        decreasing_line_color="red",
+# Pattern markers are computed vectorized over the whole frame and drawn as one trace
+chart_patterns = None
+if chart_type == "Candlestick":
+    chart_patterns = tuple(st.multiselect(
+        "Candlestick patterns",
+        list(PATTERNS),
+        default=list(CHART_PATTERNS),
+        format_func=lambda n: PATTERNS[n][0],
     ))
 
-fig.update_layout(
+# Overlays are derived from cached prefix arrays, so moving the anchor or bins stays cheap
+ov1, ov2, ov3 = st.columns(3)
+with ov1:
+    show_vwap = st.checkbox("Anchored VWAP")
+    show_profile = st.checkbox("Volume profile")
+with ov2:
+    anchor_date = st.date_input(
+        "Anchor date",
+        df.index[0].date(),
+        min_value=df.index[0].date(),
+        max_value=df.index[-1].date(),
+    )
+with ov3:
+    profile_bins = st.slider("Profile bins", 10, 100, 40)
+
+# Draw chart (base chart cached per data fingerprint, chart type and layout;
+# overlays are added to a copy and cached per overlay setting)
+fig = price_chart_with_overlays(
+    df,
+    chart_type=chart_type,
+    name=selected_market,
+    vwap_anchor=str(anchor_date) if show_vwap else None,
+    profile_bins=profile_bins if show_profile else None,
+    profile_anchor=str(anchor_date) if show_profile else None,
+    patterns=chart_patterns,
     title=f"{selected_market} - {period_option} Performance",
     height=500,
-    hovermode="x unified",
 )
 
 st.plotly_chart(fig, use_container_width=True)
@@ -269,7 +297,16 @@ if selected_ticker.startswith("^") or selected_ticker.endswith("USD"):
     st.info("Fundamental data is available only for individual stocks.")
 else:
     st.subheader("Fundamentals and Events")
-    tkr = yf.Ticker(selected_ticker)
+    tkr = yf.Ticker(selected_ticker, session=yf_session())
+
+    # Fetch the independent sources concurrently; the slowest one sets the wait
+    fundamentals = (
+        TaskGraph()
+        .add("bars", lambda: load_bars(selected_ticker, adjust="split"), timeout=30)
+        .add("calendar", lambda: tkr.calendar, timeout=15)
+        .add("info", lambda: tkr.info, timeout=15)
+        .results()
+    )
 
     tab1, tab2, tab3 = st.tabs(
         ["Dividends & Splits", "Earnings", "Analyst Targets"]
@@ -278,7 +315,9 @@ else:
     # Dividends/Splits
     with tab1:
         st.write("**Dividends**")
-        dividends = tkr.dividends
+        # Corporate actions come with the stored bars, no extra download
+        bars = fundamentals["bars"][0]
+        dividends = dividends_series(bars) if bars is not None else None
         def _has_data(obj):
             if obj is None:
                 return False
@@ -297,7 +336,7 @@ else:
         if _has_data(dividends):
             try:
                 st.line_chart(dividends)
-                st.dataframe(dividends)
+                paged_table(dividends, key="dividends_table", use_container_width=True)
             except Exception:
                 # fallback to showing raw object
                 st.write(dividends)
@@ -305,10 +344,10 @@ else:
             st.info("No dividend data.")
 
         st.write("**Splits**")
-        splits = tkr.splits
+        splits = splits_series(bars) if bars is not None else None
         if _has_data(splits):
             try:
-                st.dataframe(splits)
+                paged_table(splits, key="splits_table", controls=False, use_container_width=True)
             except Exception:
                 st.write(splits)
         else:
@@ -316,11 +355,7 @@ else:
 
     # Earnings
     with tab2:
-        cal = None
-        try:
-            cal = tkr.calendar
-        except Exception:
-            cal = None
+        cal = fundamentals["calendar"][0]
 
         if _has_data(cal):
             # calendar may be a DataFrame or a dict depending on yfinance version
@@ -342,7 +377,7 @@ else:
 
     # Analyst targets
     with tab3:
-        info = tkr.info
+        info = fundamentals["info"][0] or {}
         fields = [
             ("Target High", "targetHighPrice"),
             ("Target Mean", "targetMeanPrice"),
@@ -389,23 +424,22 @@ if st.button("Compute Correlation"):
     if len(tickers) < 2:
         st.warning("Enter at least two tickers.")
     else:
-        prices = yf.download(
-            tickers,
-            period=corr_mapping[corr_period],
-            interval="1d",
-            auto_adjust=True,
-            progress=False,
-        )["Close"]
-
-        if isinstance(prices, pd.Series):
-            prices = prices.to_frame()
-
-        prices = prices.dropna()
+        # Total-return closes derived locally from each ticker's stored bars
+        closes = {}
+        for t in tickers:
+            try:
+                closes[t] = load_bars(t, period=corr_mapping[corr_period], adjust="total")["Close"]
+            except Exception:
+                continue
+        prices = pd.DataFrame(closes)
+
+        # As-of align instead of dropna() so one closed market doesn't drop the date for all
+        prices = align_prices(prices).dropna(how="all")
         if prices.empty:
             st.info("No price data for the selected tickers.")
         else:
-            returns = prices.pct_change().dropna()
-            corr = returns.corr()
+            returns = prices.pct_change(fill_method=None).iloc[1:]
+            corr = returns.corr(min_periods=20)
 
             st.markdown("Correlation table")
             st.dataframe(corr, use_container_width=True)
@@ -1,5 +1,15 @@
+import numpy as np
 import plotly.graph_objects as go
 
+from components.figure_cache import figure_cache, figure_key
+from services.volume_profile import get_profile, value_area
+from services.patterns import pattern_hits
+
+# Reversal patterns shown by default; gaps, dojis and inside bars are frequent enough to clutter a chart
+CHART_PATTERNS = ("hammer", "bullish_engulfing", "bearish_engulfing", "morning_star", "evening_star")
+# Columns the price chart and its overlays are drawn from (its cache key)
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
 def price_chart_with_bands(df, ticker):
     fig = go.Figure()
     fig.add_trace(go.Scatter(x=df.index, y=df["Close"], name="Close"))
@@ -23,7 +33,32 @@ def macd_chart(df):
     fig.add_trace(go.Bar(x=df.index, y=df["Histogram"], name="Histogram"))
     return fig
 
-def levels_candlestick(df, levels):
+def add_pattern_trace(fig, df, patterns=CHART_PATTERNS):
+    # All hits go into one marker trace: bullish below the low, bearish above the high
+    hits = pattern_hits(df, patterns)
+    if hits.empty:
+        return fig
+    per_bar = hits.groupby("date", sort=True).agg(label=("label", ", ".join), direction=("direction", "sum"))
+    bars = df.loc[per_bar.index]
+    direction = per_bar["direction"].to_numpy()
+    pad = (bars["High"] - bars["Low"]).to_numpy() * 0.3
+    y = np.where(direction >= 0, bars["Low"].to_numpy() - pad, bars["High"].to_numpy() + pad)
+    fig.add_trace(go.Scatter(
+        x=per_bar.index,
+        y=y,
+        mode="markers",
+        name="Patterns",
+        text=per_bar["label"],
+        hovertemplate="%{x|%Y-%m-%d}: %{text}<extra></extra>",
+        marker=dict(
+            size=9,
+            symbol=np.where(direction > 0, "triangle-up", np.where(direction < 0, "triangle-down", "diamond")),
+            color=np.where(direction > 0, "green", np.where(direction < 0, "red", "gray")),
+        ),
+    ))
+    return fig
+
+def levels_candlestick(df, levels, patterns=CHART_PATTERNS):
     fig = go.Figure(data=[go.Candlestick(
         x=df.index,
         open=df["Open"],
@@ -34,4 +69,88 @@ def levels_candlestick(df, levels):
 
     for kind, date, level in levels:
         fig.add_hline(y=level, line_dash="dot")
+    if patterns:
+        add_pattern_trace(fig, df, patterns)
+    return fig
+
+def price_chart(df, chart_type="Line", name="Close", patterns=None, **layout):
+    fig = go.Figure()
+    if chart_type == "Line":
+        fig.add_trace(go.Scatter(x=df.index, y=df["Close"], mode="lines", name=name))
+    else:
+        fig.add_trace(go.Candlestick(
+            x=df.index,
+            open=df["Open"],
+            high=df["High"],
+            low=df["Low"],
+            close=df["Close"],
+            increasing_line_color="green",
+            decreasing_line_color="red",
+            name=name
+        ))
+        if patterns:
+            add_pattern_trace(fig, df, patterns)
+    fig.update_layout(hovermode="x unified", **layout)
+    return fig
+
+def volume_chart(df, **layout):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=df.index, y=df["Volume"], name="Volume"))
+    fig.update_layout(**layout)
     return fig
+
+def add_overlays(fig, df, vwap_anchor=None, profile_bins=None, profile_anchor=None):
+    """
+    Add anchored VWAP and volume profile traces to `fig` in place.
+    """
+    vp = get_profile(df)
+    if vwap_anchor is not None:
+        vwap = vp.vwap(vwap_anchor)
+        fig.add_trace(go.Scatter(x=vwap.index, y=vwap, mode="lines", name="Anchored VWAP", line=dict(color="orange", width=2)))
+
+    edges, volumes = vp.profile(profile_anchor, profile_bins) if profile_bins else ([], [])
+    if len(volumes) and volumes.sum() > 0:
+        poc, val, vah = value_area(edges, volumes)
+        centers = (edges[:-1] + edges[1:]) / 2
+        fig.add_trace(go.Bar(
+            x=volumes,
+            y=centers,
+            orientation="h",
+            xaxis="x2",
+            name="Volume profile",
+            marker_color="rgba(100, 149, 237, 0.35)",
+            width=(edges[1] - edges[0]) * 0.9,
+            hovertemplate="Price %{y:.2f}<br>Volume %{x:,.0f}<extra></extra>"
+        ))
+        fig.add_hline(y=poc, line_color="red", line_dash="dash", annotation_text="POC")
+        fig.add_hrect(y0=val, y1=vah, fillcolor="gray", opacity=0.1, line_width=0)
+        # Profile bars hug the right edge, sized to a quarter of the plot width
+        fig.update_layout(xaxis2=dict(overlaying="x", side="top", range=[volumes.max() * 4, 0], showticklabels=False, showgrid=False))
+    return fig
+
+
+def price_chart_with_overlays(df, chart_type="Line", name="Close", vwap_anchor=None, profile_bins=None, profile_anchor=None, patterns=None, **layout):
+    """
+    Cached price chart with optional VWAP and volume profile overlays.
+
+    The base chart (including the pattern scan) is cached without the
+    overlay settings, so moving the anchor or bins only adds overlay traces
+    to a fresh copy of it. Overlay settings enter the key only while their
+    overlay is shown.
+    """
+    base_key = figure_key(df, chart_type, PRICE_COLUMNS, chart_type=chart_type, name=name, patterns=patterns, **layout)
+
+    def base():
+        return figure_cache.get_or_build(base_key, lambda: price_chart(df, chart_type, name, patterns, **layout))
+
+    overlays = {}
+    if vwap_anchor is not None:
+        overlays["vwap_anchor"] = vwap_anchor
+    if profile_bins:
+        overlays.update(profile_bins=profile_bins, profile_anchor=profile_anchor)
+    if not overlays:
+        return base()
+
+    # The cache hands out a fresh figure, so the overlays can be added to it in place
+    key = (base_key, "overlays", tuple(sorted(overlays.items())))
+    return figure_cache.get_or_build(key, lambda: add_overlays(base(), df, **overlays))
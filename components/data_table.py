@@ -0,0 +1,222 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import streamlit as st
+
+from components.figure_cache import fingerprint
+
+MAX_FRAMES = 32
+MAX_BYTES = 256 * 1024 * 1024
+# Sorted/filtered row orders kept per frame
+MAX_QUERIES = 16
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+class ArrowFrame:
+    """
+    A frame converted to Arrow once, with cached row orders for sort/filter
+    queries. Pages are taken from the table by index, so a rerun only ever
+    ships `page_size` rows to the browser.
+    """
+
+    def __init__(self, df):
+        # A default RangeIndex carries no information, anything else becomes a column
+        plain = isinstance(df.index, pd.RangeIndex) and df.index.name is None
+        self.table = pa.Table.from_pandas(df.reset_index(drop=plain), preserve_index=False)
+        self.columns = self.table.column_names
+        self.nbytes = self.table.nbytes
+        self._queries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def kind(self, column):
+        t = self.table.schema.field(column).type
+        if pa.types.is_timestamp(t) or pa.types.is_date(t):
+            return "date"
+        if pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_decimal(t):
+            return "number"
+        return "text"
+
+    def bounds(self, column):
+        mm = pc.min_max(self.table[column])
+        return mm["min"].as_py(), mm["max"].as_py()
+
+    def _mask(self, column, value):
+        col = self.table[column]
+        kind = self.kind(column)
+        if kind == "text":
+            return pc.match_substring(pc.cast(col, pa.string()), value, ignore_case=True)
+        lo, hi = value
+        if kind == "date":
+            # Inclusive calendar-day range over timestamps
+            lo = pa.scalar(pd.Timestamp(lo), type=col.type)
+            hi = pa.scalar(pd.Timestamp(hi) + pd.Timedelta(days=1), type=col.type)
+            return pc.and_(pc.greater_equal(col, lo), pc.less(col, hi))
+        return pc.and_(pc.greater_equal(col, lo), pc.less_equal(col, hi))
+
+    def _order(self, sort_by, ascending, filters):
+        if sort_by is not None:
+            order = pc.sort_indices(
+                self.table,
+                sort_keys=[(sort_by, "ascending" if ascending else "descending")],
+            )
+        else:
+            order = pa.array(range(len(self)), type=pa.int64())
+        for column, value in filters:
+            mask = pc.fill_null(self._mask(column, value), False)
+            order = pc.filter(order, pc.take(mask, order))
+        return order
+
+    def query(self, sort_by=None, ascending=True, filters=None):
+        """
+        Row positions for a sort/filter query, or None for the natural order.
+        """
+        filters = tuple(sorted((filters or {}).items()))
+        if sort_by is None and not filters:
+            return None
+        key = (sort_by, ascending, filters)
+        with self._lock:
+            order = self._queries.get(key)
+            if order is not None:
+                self._queries.move_to_end(key)
+                return order
+
+        order = self._order(sort_by, ascending, filters)
+        with self._lock:
+            self._queries[key] = order
+            while len(self._queries) > MAX_QUERIES:
+                self._queries.popitem(last=False)
+        return order
+
+    def page(self, order, offset, size):
+        if order is None:
+            # Zero-copy slice of the cached table
+            return self.table.slice(offset, size)
+        return self.table.take(order.slice(offset, size))
+
+
+_frames = OrderedDict()
+_frames_bytes = 0
+_frames_lock = threading.Lock()
+
+
+def arrow_frame(df):
+    """
+    Cached ArrowFrame for a frame, keyed by its content.
+    """
+    global _frames_bytes
+    key = fingerprint(df)
+    with _frames_lock:
+        frame = _frames.get(key)
+        if frame is not None:
+            _frames.move_to_end(key)
+            return frame
+
+    frame = ArrowFrame(df)
+    with _frames_lock:
+        if key not in _frames:
+            _frames[key] = frame
+            _frames_bytes += frame.nbytes
+        while len(_frames) > 1 and (len(_frames) > MAX_FRAMES or _frames_bytes > MAX_BYTES):
+            _, old = _frames.popitem(last=False)
+            _frames_bytes -= old.nbytes
+    return frame
+
+
+def _filter_controls(frame, key):
+    """
+    One column filter: a range for numbers and dates, a substring for text.
+    """
+    fcol1, fcol2 = st.columns([1, 2])
+    with fcol1:
+        column = st.selectbox("Filter column", ["(none)"] + frame.columns, key=f"{key}_filter_col")
+    if column == "(none)":
+        return {}
+
+    kind = frame.kind(column)
+    with fcol2:
+        if kind == "text":
+            text = st.text_input("Contains", key=f"{key}_filter_text_{column}")
+            return {column: text} if text else {}
+
+        lo, hi = frame.bounds(column)
+        if lo is None:
+            return {}
+        if kind == "date":
+            picked = st.date_input(
+                "Between",
+                (lo.date(), hi.date()),
+                min_value=lo.date(),
+                max_value=hi.date(),
+                key=f"{key}_filter_dates_{column}",
+            )
+            if len(picked) != 2:
+                return {}
+            return {column: (picked[0], picked[1])}
+
+        rcol1, rcol2 = st.columns(2)
+        with rcol1:
+            low = st.number_input("Min", value=float(lo), key=f"{key}_filter_min_{column}")
+        with rcol2:
+            high = st.number_input("Max", value=float(hi), key=f"{key}_filter_max_{column}")
+        return {column: (low, high)}
+
+
+def paged_table(data, key, page_size=PAGE_SIZES[0], controls=True, **kwargs):
+    """
+    Server-side paginated table for long frames.
+
+    The frame is converted to Arrow once and cached; sorting and filtering
+    run over the cached columns and only the visible page of rows is sent
+    to the browser, so the per-rerun payload does not grow with history.
+    Extra keyword arguments go to st.dataframe.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    frame = arrow_frame(data)
+
+    sort_by, ascending, filters = None, True, {}
+    if controls:
+        scol1, scol2 = st.columns([2, 1])
+        with scol1:
+            choice = st.selectbox("Sort by", ["(original order)"] + frame.columns, key=f"{key}_sort")
+        with scol2:
+            descending = st.checkbox("Descending", key=f"{key}_desc")
+        if choice != "(original order)":
+            sort_by, ascending = choice, not descending
+        filters = _filter_controls(frame, key)
+
+    order = frame.query(sort_by, ascending, filters)
+    total = len(frame) if order is None else len(order)
+
+    size = st.session_state.get(f"{key}_size", page_size)
+    pages = max(1, -(-total // size))
+    page_key = f"{key}_page"
+    # A new query starts again from the first page
+    signature = (sort_by, ascending, tuple(sorted(filters.items())), total, size)
+    if st.session_state.get(f"{key}_query") != signature:
+        st.session_state[f"{key}_query"] = signature
+        st.session_state[page_key] = 1
+    page = min(st.session_state.get(page_key, 1), pages)
+
+    offset = (page - 1) * size
+    st.dataframe(frame.page(order, offset, size), hide_index=True, **kwargs)
+
+    if total > min(PAGE_SIZES):
+        pcol1, pcol2, pcol3 = st.columns([1, 1, 2])
+        with pcol1:
+            st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+        with pcol2:
+            sizes = sorted(set(PAGE_SIZES) | {page_size})
+            st.selectbox("Rows per page", sizes, index=sizes.index(size), key=f"{key}_size")
+        with pcol3:
+            shown = f"Rows {offset + 1 if total else 0}–{min(offset + size, total)} of {total}"
+            if total != len(frame):
+                shown += f" (filtered from {len(frame)})"
+            st.caption(shown)
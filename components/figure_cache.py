@@ -0,0 +1,115 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import sys
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# orjson encodes NumPy arrays natively instead of going through Python lists;
+# Streamlit serializes figures through plotly.io, so this applies to every chart
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+
+MAX_ENTRIES = 128
+MAX_BYTES = 256 * 1024 * 1024
+
+
+def fingerprint(df, columns=None):
+    """
+    Content hash of a frame (values, index and column names).
+    """
+    data = df if columns is None else df[list(columns)]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    h.update(repr(list(data.columns)).encode())
+    return h.hexdigest()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _payload_bytes(value):
+    """
+    Bytes held by a figure dict: its arrays, strings and containers.
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_payload_bytes(k) + _payload_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_payload_bytes(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+class FigureCache:
+    """
+    LRU of built figures, bounded by entry count and bytes.
+
+    Entries are stored as plain figure dicts (plotly packs trace arrays
+    into typed binary blocks) and sized by what that dict holds. Every hit
+    hands out a new go.Figure, so a caller changing its layout never
+    touches the cached copy other sessions read.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return go.Figure(entry[0])
+            self.misses += 1
+
+        fig = build()
+        payload = fig.to_dict()
+        size = _payload_bytes(payload)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (payload, size)
+                self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, old) = self._entries.popitem(last=False)
+                self._bytes -= old
+        return fig
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+figure_cache = FigureCache()
+
+
+def figure_key(df, kind, columns=None, **params):
+    return (fingerprint(df, columns), kind, _freeze(params))
+
+
+def cached_figure(build, df, kind, columns=None, **params):
+    """
+    Return build(df, **params), reusing the cached figure when the data
+    fingerprint, chart kind and layout parameters are unchanged.
+    """
+    key = figure_key(df, kind, columns, **params)
+    return figure_cache.get_or_build(key, lambda: build(df, **params))
@@ -0,0 +1,248 @@
+"""
+Multi-session load test for the dashboard, fully offline.
+
+Drives N concurrent headless sessions (Streamlit AppTest) through the
+scripted interactions below against the local data stand-in, then reports
+throughput, rerun latency percentiles and CPU/RSS per session.
+
+    python -m loadtest.run --sessions 8 --iterations 3 --latency 0.05
+    python -m loadtest.run --sessions 8 --save baseline.json
+    python -m loadtest.run --sessions 8 --compare baseline.json
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT_TIMEOUT = 120
+
+
+def _script(path):
+    return os.path.join(REPO_ROOT, path)
+
+
+def _by_label(widgets, label):
+    for w in widgets:
+        if w.label == label:
+            return w
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def open_overview(state):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(_script("Main.py"), default_timeout=SCRIPT_TIMEOUT)
+    state["main"] = at
+    return at.run()
+
+
+def toggle_chart(state):
+    at = state["main"]
+    radio = _by_label(at.radio, "Chart type")
+    radio.set_value("Candlestick" if radio.value == "Line" else "Line")
+    return at.run()
+
+
+def run_analyze(state):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(_script("pages/5_Technical_Analysis.py"), default_timeout=SCRIPT_TIMEOUT).run()
+    _by_label(at.button, "Analyze").click()
+    return at.run()
+
+
+def run_compare(state):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(_script("pages/6_Comparisons.py"), default_timeout=SCRIPT_TIMEOUT).run()
+    _by_label(at.button, "Compare").click()
+    return at.run()
+
+
+def load_news(state):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(_script("pages/7_News.py"), default_timeout=SCRIPT_TIMEOUT).run()
+    _by_label(at.button, "Load News").click()
+    return at.run()
+
+
+SCENARIO = [
+    ("open_overview", open_overview),
+    ("toggle_chart", toggle_chart),
+    ("run_analyze", run_analyze),
+    ("run_compare", run_compare),
+    ("load_news", load_news),
+]
+
+
+def _rss_bytes():
+    # Current resident set from /proc where available, else peak RSS
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_session(session_id, iterations, samples, errors, lock):
+    state = {}
+    for _ in range(iterations):
+        for step, fn in SCENARIO:
+            start = time.perf_counter()
+            try:
+                at = fn(state)
+                failed = [e.value for e in at.exception] if at.exception else []
+            except Exception as e:
+                failed = [repr(e)]
+            elapsed = time.perf_counter() - start
+            with lock:
+                samples.append((step, elapsed))
+                if failed:
+                    errors.append((session_id, step, failed[0]))
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0, "p50": float("nan"), "p95": float("nan"), "p99": float("nan")}
+    arr = np.asarray(values) * 1000
+    return {
+        "count": len(values),
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "p99": float(np.percentile(arr, 99)),
+    }
+
+
+def run(sessions, iterations, latency, jitter):
+    from loadtest.standin import install
+    from services.memory_budget import memory
+    from services.http_client import metrics as http_metrics
+
+    standin = install(latency=latency, jitter=jitter)
+    samples, errors = [], []
+    lock = threading.Lock()
+
+    rss_before = _rss_bytes()
+    cpu_before = os.times()
+    wall_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        for i in range(sessions):
+            pool.submit(run_session, i, iterations, samples, errors, lock)
+
+    wall = time.perf_counter() - wall_start
+    cpu_after = os.times()
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    rss_after = _rss_bytes()
+
+    steps = {name: percentiles([t for s, t in samples if s == name]) for name, _ in SCENARIO}
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "latency": latency,
+        "wall_seconds": wall,
+        "throughput_rps": len(samples) / wall if wall else float("nan"),
+        "overall": percentiles([t for _, t in samples]),
+        "steps": steps,
+        "cpu_seconds_per_session": cpu / sessions,
+        "rss_mb_total": rss_after / 2 ** 20,
+        "rss_mb_per_session": max(rss_after - rss_before, 0) / sessions / 2 ** 20,
+        "upstream_calls": dict(standin.calls),
+        "memory_budget": memory.stats(),
+        "http": http_metrics(),
+        "errors": len(errors),
+        "error_samples": [f"session {s} {step}: {msg}" for s, step, msg in errors[:5]],
+    }
+
+
+def print_report(report, baseline=None):
+    def delta(path, value):
+        if baseline is None:
+            return ""
+        ref = baseline
+        for key in path:
+            ref = ref.get(key, {}) if isinstance(ref, dict) else {}
+        if not isinstance(ref, (int, float)) or not ref:
+            return ""
+        return f"  ({(value / ref - 1) * 100:+.1f}%)"
+
+    print(f"Sessions: {report['sessions']}  iterations: {report['iterations']}  upstream latency: {report['latency'] * 1000:.0f} ms")
+    print(f"Wall time: {report['wall_seconds']:.2f} s")
+    print(f"Throughput: {report['throughput_rps']:.2f} reruns/s{delta(['throughput_rps'], report['throughput_rps'])}")
+    print()
+    print(f"{'step':<16}{'count':>7}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}")
+    rows = list(report["steps"].items()) + [("overall", report["overall"])]
+    for name, stats in rows:
+        path = ["steps", name] if name != "overall" else ["overall"]
+        print(
+            f"{name:<16}{stats['count']:>7}{stats['p50']:>12.1f}{stats['p95']:>12.1f}{stats['p99']:>12.1f}"
+            f"{delta(path + ['p95'], stats['p95'])}"
+        )
+    print()
+    print(f"CPU per session: {report['cpu_seconds_per_session']:.2f} s{delta(['cpu_seconds_per_session'], report['cpu_seconds_per_session'])}")
+    print(f"RSS total: {report['rss_mb_total']:.1f} MB, growth per session: {report['rss_mb_per_session']:.1f} MB")
+    print(f"Upstream calls: {report['upstream_calls']}")
+    net = report.get("http")
+    if net and net["requests"]:
+        reuse = f"{net['connection_reuse']:.0%}" if net["connection_reuse"] is not None else "n/a"
+        print(f"HTTP: {net['requests']} requests, {net['network']} to network, connection reuse {reuse}, cache hit ratio {net['cache_hit_ratio']:.0%}")
+    mem = report.get("memory_budget")
+    if mem:
+        print(
+            f"Session data: {mem['bytes'] / 2 ** 20:.1f} MB resident in {mem['resident']}/{mem['entries']} entries, "
+            f"{mem['evictions']} evictions, {mem['reloads']} reloads"
+        )
+    if report["errors"]:
+        print(f"Errors: {report['errors']}")
+        for line in report["error_samples"]:
+            print(f"  {line}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline multi-session load test for the dashboard.")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--keep-cache", action="store_true", help="reuse the existing working dir caches")
+    parser.add_argument("--save", help="write the report as JSON")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    args = parser.parse_args(argv)
+    save = os.path.abspath(args.save) if args.save else None
+    compare = os.path.abspath(args.compare) if args.compare else None
+
+    if not args.keep_cache:
+        # Fresh on-disk and shared caches so runs are comparable
+        workdir = tempfile.mkdtemp(prefix="gmd-loadtest-")
+        os.environ["GMD_SHARED_CACHE"] = os.path.join(workdir, "shared")
+        os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+    # Overview quotes come from the local simulated stream, not Yahoo
+    os.environ.setdefault("GMD_QUOTE_FEED", "simulated")
+
+    report = run(args.sessions, args.iterations, args.latency, args.jitter)
+
+    baseline = None
+    if compare:
+        with open(compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if save:
+        with open(save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
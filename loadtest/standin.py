@@ -0,0 +1,171 @@
+"""
+Local stand-in for every outbound market-data call the app makes.
+
+install() swaps yf.download, yf.Ticker and the shared HTTP client's feed
+parser for deterministic synthetic generators that sleep for a configurable
+latency, so load tests run offline and are repeatable. It must run before
+the app's modules are imported.
+"""
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+HISTORY_START = "1995-01-02"
+FIELDS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653, "20y": 7305,
+}
+
+
+class StandIn:
+    def __init__(self, latency=0.05, jitter=0.02, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.calls = {"download": 0, "history": 0, "info": 0, "rss": 0}
+        self._lock = threading.Lock()
+        self._series = {}
+        self._rng = np.random.default_rng(seed)
+
+    def _wait(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        time.sleep(delay)
+
+    def bars(self, ticker):
+        """
+        Full synthetic daily history for a ticker, identical on every call.
+        """
+        with self._lock:
+            cached = self._series.get(ticker)
+        if cached is not None:
+            return cached
+
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()) + self.seed)
+        days = 7 if ticker.endswith("-USD") else 5
+        index = pd.date_range(HISTORY_START, pd.Timestamp.today().normalize(), freq="D" if days == 7 else "B")
+        n = len(index)
+        close = 50 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+        open_ = close * np.exp(rng.normal(0, 0.004, n))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, n)))
+        frame = pd.DataFrame({
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(1_000_000, 50_000_000, n).astype(float),
+            "Dividends": np.where(np.arange(n) % 63 == 62, close * 0.004, 0.0),
+            "Stock Splits": 0.0,
+        }, index=index)
+        frame.index.name = "Date"
+
+        with self._lock:
+            self._series[ticker] = frame
+        return frame
+
+    def _slice(self, frame, period=None, start=None, end=None):
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        if end is not None:
+            frame = frame[frame.index < pd.Timestamp(end)]
+        if period in PERIOD_DAYS:
+            frame = frame[frame.index > frame.index[-1] - pd.Timedelta(days=PERIOD_DAYS[period])]
+        return frame
+
+    def download(self, tickers, period=None, start=None, end=None, **kwargs):
+        self._wait("download")
+        single = isinstance(tickers, str)
+        symbols = [tickers] if single else list(tickers)
+        frames = {t: self._slice(self.bars(t), period, start, end)[FIELDS] for t in symbols}
+        if single:
+            return frames[tickers].copy()
+        out = pd.concat(frames, axis=1)
+        # yf.download(group_by="column") layout: (field, ticker)
+        return out.swaplevel(0, 1, axis=1).sort_index(axis=1)
+
+    def ticker(self, symbol, session=None):
+        return StandInTicker(self, symbol.upper())
+
+    def rss(self, url, *args, **kwargs):
+        self._wait("rss")
+        symbol = url.rsplit("=", 1)[-1]
+        now = pd.Timestamp.now()
+        entries = [
+            {
+                "title": f"{symbol} headline {i + 1}",
+                "published": (now - pd.Timedelta(hours=i)).strftime("%a, %d %b %Y %H:%M:%S"),
+                "link": f"http://localhost/news/{symbol}/{i + 1}",
+            }
+            for i in range(20)
+        ]
+        return SimpleNamespace(entries=entries)
+
+
+class StandInTicker:
+    def __init__(self, standin, symbol):
+        self._standin = standin
+        self.ticker = symbol
+
+    def history(self, period="1mo", start=None, end=None, **kwargs):
+        self._standin._wait("history")
+        frame = self._standin.bars(self.ticker)
+        out = self._standin._slice(frame, None if start else period, start, end)
+        return out.drop(columns=["Adj Close"]).copy()
+
+    @property
+    def info(self):
+        self._standin._wait("info")
+        last = float(self._standin.bars(self.ticker)["Close"].iloc[-1])
+        return {
+            "longName": f"{self.ticker} Corp",
+            "currency": "USD",
+            "currentPrice": last,
+            "targetHighPrice": last * 1.3,
+            "targetMeanPrice": last * 1.1,
+            "targetLowPrice": last * 0.8,
+            "numberOfAnalystOpinions": 25,
+            "recommendationKey": "buy",
+        }
+
+    @property
+    def fast_info(self):
+        return {"currency": "USD"}
+
+    @property
+    def calendar(self):
+        self._standin._wait("info")
+        return {"Earnings Date": [pd.Timestamp.today().normalize() + pd.Timedelta(days=30)]}
+
+    @property
+    def dividends(self):
+        d = self._standin.bars(self.ticker)["Dividends"]
+        return d[d > 0]
+
+    @property
+    def splits(self):
+        s = self._standin.bars(self.ticker)["Stock Splits"]
+        return s[s > 0]
+
+
+def install(latency=0.05, jitter=0.02, seed=0):
+    """
+    Route yfinance and feed fetches through a StandIn and return it.
+    """
+    import yfinance as yf
+
+    import services.http_client as http_client
+
+    standin = StandIn(latency, jitter, seed)
+    yf.download = standin.download
+    yf.Ticker = standin.ticker
+    http_client.parse_feed = standin.rss
+    return standin
@@ -0,0 +1,87 @@
+import streamlit as st
+import pandas as pd
+
+from services.alerts import ALERT_FIELDS, ALERT_OPS, AlertEngine, describe
+from services.watchlist import load_watchlist
+
+st.set_page_config(page_title="Alerts", layout="wide")
+
+st.title("Price and Indicator Alerts")
+st.markdown("Alerts on watchlist symbols are checked in the background as new bars arrive.")
+st.caption(
+    "An alert fires when the value crosses its threshold from one bar to the next. "
+    "A new alert also fires once on its first check if the latest bar is already past the threshold."
+)
+
+
+@st.cache_resource
+def get_alert_engine():
+    # One engine per server process; only one process at a time runs the monitor
+    engine = AlertEngine()
+    engine.start(interval=300)
+    return engine
+
+
+engine = get_alert_engine()
+# Rules and fired alerts may have been written by another server process
+engine.reload()
+
+if "watchlist" not in st.session_state:
+    st.session_state.watchlist = load_watchlist()
+
+symbols = [e["ticker"] for e in st.session_state.watchlist]
+
+# -----------------------------
+# NEW RULE
+# -----------------------------
+st.subheader("New Alert")
+
+if not symbols:
+    st.info("Watchlist is empty. Add tickers on the main page first.")
+else:
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        ticker = st.selectbox("Ticker", symbols)
+    with col2:
+        field = st.selectbox("Field", ALERT_FIELDS)
+    with col3:
+        op = st.selectbox("Condition", ALERT_OPS)
+    with col4:
+        threshold = st.number_input("Threshold", value=30.0 if field == "RSI" else 100.0)
+
+    if st.button("Add Alert"):
+        rule = engine.add_rule(ticker, field, op, threshold)
+        st.success(f"Alert added: {describe(rule)}")
+
+st.write("---")
+
+# -----------------------------
+# RULES
+# -----------------------------
+st.subheader("Active Alerts")
+
+rules = list(engine.index.rules.values())
+if not rules:
+    st.info("No alerts defined.")
+else:
+    st.dataframe(pd.DataFrame(rules).drop(columns="primed", errors="ignore"), use_container_width=True, hide_index=True)
+    to_remove = st.selectbox("Remove alert", rules, format_func=describe)
+    if st.button("Remove"):
+        engine.remove_rule(to_remove["id"])
+        st.rerun()
+
+st.write("---")
+
+# -----------------------------
+# FIRED
+# -----------------------------
+st.subheader("Fired Alerts")
+
+if st.button("Check now"):
+    fired = engine.check()
+    st.success(f"{len(fired)} new alert(s) fired.")
+
+if engine.fired:
+    st.dataframe(pd.DataFrame(engine.fired[::-1]), use_container_width=True, hide_index=True)
+else:
+    st.info("No alerts have fired yet.")
@@ -0,0 +1,152 @@
+import time
+
+import streamlit as st
+
+from services.constituents import INDEX_CONSTITUENTS, get_constituents
+from services.screener import load_stats, refresh_stats, screen
+from services.patterns import PATTERNS, PatternCache, scan_universe
+from services.watchlist import load_watchlist
+
+st.set_page_config(page_title="Screener", layout="wide")
+
+st.title("Stock Screener")
+st.markdown("Filters run over a materialized per-ticker stats table, refreshed only for tickers with new bars.")
+
+
+@st.cache_data(ttl=86400, show_spinner="Loading constituents...")
+def load_universe(index_name):
+    return [c["symbol"] for c in get_constituents(index_name)]
+
+
+@st.cache_resource
+def get_pattern_cache():
+    return PatternCache()
+
+
+def render_patterns(universe):
+    """
+    Candlestick pattern scan over the universe; independent of the stats table.
+    """
+    st.subheader("Candlestick Patterns")
+    st.caption("Detected in one batched pass over the universe; only bars added since the last scan are evaluated.")
+
+    pattern_cache = get_pattern_cache()
+
+    pcol1, pcol2 = st.columns(2)
+    with pcol1:
+        pattern_days = st.slider("Within the last N days", 1, 30, 5)
+    with pcol2:
+        wanted = st.multiselect("Patterns", list(PATTERNS), default=list(PATTERNS), format_func=lambda n: PATTERNS[n][0])
+
+    if st.button("Scan patterns"):
+        start = time.perf_counter()
+        with st.spinner(f"Scanning {len(universe)} tickers..."):
+            scanned = scan_universe(universe, pattern_cache)
+        st.success(f"{scanned} ticker(s) evaluated in {time.perf_counter() - start:.1f} s.")
+
+    recent = pattern_cache.recent(universe, days=pattern_days)
+    recent = recent[recent["pattern"].isin(wanted)]
+    if recent.empty:
+        st.info("No recent patterns for this universe. Click 'Scan patterns' to update detections.")
+    else:
+        st.dataframe(recent.drop(columns="pattern"), use_container_width=True, hide_index=True)
+
+
+# -----------------------------
+# UNIVERSE
+# -----------------------------
+universe_options = ["Watchlist", "Custom"] + list(INDEX_CONSTITUENTS.keys())
+universe_choice = st.selectbox("Universe", universe_options)
+
+if universe_choice == "Watchlist":
+    if "watchlist" not in st.session_state:
+        st.session_state.watchlist = load_watchlist()
+    universe = [e["ticker"] for e in st.session_state.watchlist]
+elif universe_choice == "Custom":
+    custom = st.text_input("Tickers (comma separated)", "AAPL, MSFT, NVDA, TSLA, AMZN, GOOGL, META")
+    universe = [s.strip().upper() for s in custom.split(",") if s.strip()]
+else:
+    try:
+        universe = load_universe(universe_choice)
+    except Exception as e:
+        st.error(f"Could not load constituents: {e}")
+        universe = []
+
+if st.button("Refresh stats"):
+    with st.spinner(f"Updating {len(universe)} tickers..."):
+        _, updated = refresh_stats(universe)
+    st.success(f"{updated} ticker(s) had new bars and were recomputed.")
+
+table = load_stats()
+table = table[table.index.isin(universe)] if not table.empty else table
+
+if table.empty:
+    st.info("No stats yet for this universe. Click 'Refresh stats' to build them.")
+    render_patterns(universe)
+    st.stop()
+
+missing = len(set(universe) - set(table.index))
+st.caption(f"{len(table)} tickers in table, {missing} without stats. Latest bar: {table['as_of'].max():%Y-%m-%d}")
+
+# -----------------------------
+# FILTERS
+# -----------------------------
+st.subheader("Filters")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    rsi_range = st.slider("RSI(14)", 0, 100, (0, 100))
+    above_sma200 = st.checkbox("Trading above SMA200")
+with col2:
+    ret_1m = st.slider("1M return (%)", -50, 50, (-50, 50))
+    above_sma50 = st.checkbox("Trading above SMA50")
+with col3:
+    max_from_high = st.slider("Max distance below 52w high (%)", 0, 100, 100)
+    near_support = st.number_input("Within % of nearest support (0 = off)", min_value=0.0, value=0.0, step=0.5)
+
+# A bound only applies once its slider leaves the end of the range, so rows
+# with no value (short history) and moves beyond the slider aren't hidden
+filters = []
+if rsi_range[0] > 0:
+    filters.append(("RSI", ">", rsi_range[0] - 1e-9))
+if rsi_range[1] < 100:
+    filters.append(("RSI", "<", rsi_range[1] + 1e-9))
+if ret_1m[0] > -50:
+    filters.append(("ret_1M", ">", ret_1m[0] - 1e-9))
+if ret_1m[1] < 50:
+    filters.append(("ret_1M", "<", ret_1m[1] + 1e-9))
+if max_from_high < 100:
+    filters.append(("from_high_pct", ">", -max_from_high - 1e-9))
+if above_sma200:
+    filters.append(("above_SMA200", "==", True))
+if above_sma50:
+    filters.append(("above_SMA50", "==", True))
+if near_support > 0:
+    filters.append(("to_support_pct", "<", near_support))
+
+sort_col1, sort_col2 = st.columns(2)
+with sort_col1:
+    sort_by = st.selectbox("Sort by", ["RSI", "ret_1D", "ret_1M", "ret_1Y", "from_high_pct", "to_support_pct", "price"])
+with sort_col2:
+    ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+
+# -----------------------------
+# RESULTS
+# -----------------------------
+start = time.perf_counter()
+result = screen(table, filters, sort_by=sort_by, ascending=ascending)
+elapsed_ms = (time.perf_counter() - start) * 1000
+
+st.subheader(f"Results ({len(result)} of {len(table)})")
+st.caption(f"Query time: {elapsed_ms:.1f} ms")
+
+display_cols = [
+    "price", "ret_1D", "ret_1W", "ret_1M", "ret_1Y", "high_52w", "low_52w", "from_high_pct",
+    "RSI", "MACD", "SMA50", "SMA200", "above_SMA200", "support", "to_support_pct", "resistance", "to_resistance_pct",
+]
+st.dataframe(result[display_cols].round(2), use_container_width=True)
+
+# -----------------------------
+# CANDLESTICK PATTERNS
+# -----------------------------
+render_patterns(universe)
@@ -1,10 +1,15 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 from io import BytesIO
-import plotly.graph_objects as go
 from datetime import datetime
 
+from services.patterns import PATTERNS
+from services.bar_store import REFRESH_SECONDS, load_bars
+from services.memory_budget import session_get
+from components.charts import CHART_PATTERNS, price_chart_with_overlays, volume_chart
+from components.figure_cache import cached_figure
+from components.data_table import paged_table
+
 st.set_page_config(page_title="Historical Data", layout="wide")
 
 st.title("📊 Historical Stock Data Downloader")
@@ -22,38 +27,59 @@ with col2:
 
 chart_type = st.radio("Chart Type", ["Line", "Candlestick"], horizontal=True)
 
+# Pattern markers are computed vectorized over the whole frame and drawn as one trace
+chart_patterns = None
+if chart_type == "Candlestick":
+    chart_patterns = tuple(st.multiselect(
+        "Candlestick patterns",
+        list(PATTERNS),
+        default=list(CHART_PATTERNS),
+        format_func=lambda n: PATTERNS[n][0],
+    ))
+
+# Adjusted views are derived locally from stored raw bars
+adjust_modes = {
+    "Split-adjusted": "split",
+    "Total return (dividends + splits)": "total",
+    "Unadjusted": "raw",
+}
+adjustment = st.radio("Adjustment", list(adjust_modes.keys()), horizontal=True)
+
+col3, col4, col5 = st.columns(3)
+with col3:
+    show_vwap = st.checkbox("VWAP anchored at start date")
+with col4:
+    show_profile = st.checkbox("Volume profile")
+with col5:
+    profile_bins = st.slider("Profile bins", 10, 100, 40)
+
 # -----------------------------
 # LOAD DATA
 # -----------------------------
+# Stay loaded across reruns so table paging and chart toggles don't clear the page
 if st.button("Load Data"):
-    df = yf.download(
-        ticker,
-        start=start_date,
-        end=end_date,
-        interval="1d",
-        auto_adjust=False,
-        progress=False
-    )
+    st.session_state.hist_loaded = True
 
-    if df.empty:
-        st.error("❌ No data found. Check ticker or date range.")
-    else:
-        # -----------------------------
-        # FIX 1 — Flatten MultiIndex
-        # -----------------------------
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [col[0] for col in df.columns]
+if st.session_state.get("hist_loaded"):
+    # The frame and its exports live in the session's memory budget; the
+    # loaders go back to the bar store, so an evicted entry is rebuilt on demand
+    query = f"{ticker}:{start_date}:{end_date}:{adjust_modes[adjustment]}"
 
-        # -----------------------------
-        # FIX 2 — Clean Datetime Index
-        # -----------------------------
-        df.index = pd.to_datetime(df.index)
-        if getattr(df.index, "tz", None) is not None:
-            df.index = df.index.tz_convert(None)
+    def load_history():
+        bars = load_bars(ticker, start=start_date, end=end_date, adjust=adjust_modes[adjustment])
+        return bars.dropna(subset=["Close"])
+
+    def history():
+        return session_get(f"history:{query}", load_history, ttl=REFRESH_SECONDS, compact=True)
 
-        df = df.sort_index()
-        df = df.dropna(subset=["Close"])
+    try:
+        df = history()
+    except Exception:
+        df = pd.DataFrame()
 
+    if df.empty:
+        st.error("❌ No data found. Check ticker or date range.")
+    else:
         st.success(f"Loaded {len(df)} rows of clean historical data.")
 
         # -----------------------------
@@ -61,34 +87,13 @@ if st.button("Load Data"):
         # -----------------------------
         st.subheader("Price Chart")
 
-        if chart_type == "Line":
-            fig = go.Figure()
-            fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df["Close"],
-                    mode="lines",
-                    name="Close"
-                )
-            )
-        else:
-            fig = go.Figure(
-                data=[
-                    go.Candlestick(
-                        x=df.index,
-                        open=df["Open"],
-                        high=df["High"],
-                        low=df["Low"],
-                        close=df["Close"],
-                        increasing_line_color="green",
-                        decreasing_line_color="red",
-                        name="Candlestick"
-                    )
-                ]
-            )
-
-        fig.update_layout(
-            hovermode="x unified",
+        fig = price_chart_with_overlays(
+            df,
+            chart_type=chart_type,
+            name="Close" if chart_type == "Line" else "Candlestick",
+            vwap_anchor=str(start_date) if show_vwap else None,
+            profile_bins=profile_bins if show_profile else None,
+            patterns=chart_patterns,
             height=500,
             margin=dict(l=10, r=10, t=40, b=10),
         )
@@ -100,9 +105,7 @@ if st.button("Load Data"):
         # -----------------------------
         st.subheader("Volume")
 
-        fig2 = go.Figure()
-        fig2.add_trace(go.Bar(x=df.index, y=df["Volume"], name="Volume"))
-        fig2.update_layout(height=300)
+        fig2 = cached_figure(volume_chart, df, "volume", columns=["Volume"], height=300)
 
         st.plotly_chart(fig2, use_container_width=True)
 
@@ -110,7 +113,7 @@ if st.button("Load Data"):
         # DATA TABLE
         # -----------------------------
         st.subheader("Historical Data Table")
-        st.dataframe(df, use_container_width=True)
+        paged_table(df, key="hist_table", page_size=50, use_container_width=True)
 
         # -----------------------------
         # DOWNLOAD BUTTONS (Unique keys)
@@ -118,7 +121,7 @@ if st.button("Load Data"):
         st.subheader("Download Data")
 
         # CSV
-        csv_data = df.to_csv().encode("utf-8")
+        csv_data = session_get(f"csv:{query}", lambda: history().to_csv().encode("utf-8"), ttl=REFRESH_SECONDS)
         st.download_button(
             "⬇ Download CSV",
             data=csv_data,
@@ -128,14 +131,15 @@ if st.button("Load Data"):
         )
 
         # Excel
-        excel_buffer = BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine="openpyxl") as writer:
-            df.to_excel(writer, sheet_name="Historical Data")
-        excel_buffer.seek(0)
+        def excel_bytes():
+            excel_buffer = BytesIO()
+            with pd.ExcelWriter(excel_buffer, engine="openpyxl") as writer:
+                history().to_excel(writer, sheet_name="Historical Data")
+            return excel_buffer.getvalue()
 
         st.download_button(
             "⬇ Download Excel",
-            data=excel_buffer,
+            data=session_get(f"xlsx:{query}", excel_bytes, ttl=REFRESH_SECONDS),
             file_name=f"{ticker}_historical.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             key="excel_download_hist"
@@ -1,14 +1,31 @@
 import streamlit as st
-import yfinance as yf
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import timedelta
 
+from services.bar_store import load_bars
+from services.feature_store import FeatureStore
+from services.analog_search import search_universe
+from services.watchlist import load_watchlist
+
 st.set_page_config(page_title="Forecasting", layout="wide")
 
 st.title("Simple Price Forecasting")
 
+
+@st.cache_resource
+def get_feature_store():
+    return FeatureStore()
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def load_price_array(symbol):
+    # Shared, uncopied arrays: the analog search only reads them
+    bars = load_bars(symbol, adjust="total").dropna(subset=["Close"])
+    return bars.index.to_numpy(), bars["Close"].to_numpy(dtype=float)
+
+
 ticker = st.text_input("Ticker", "AAPL")
 
 period = st.selectbox(
@@ -26,26 +43,14 @@ period_map = {
 horizon = st.slider("Forecast Horizon (days)", 10, 60, 30)
 
 if st.button("Run Forecast"):
-    df = yf.download(
-        ticker,
-        period=period_map[period],
-        interval="1d",
-        auto_adjust=False,
-        progress=False
-    )
+    try:
+        df = load_bars(ticker, period=period_map[period], adjust="split")
+    except Exception:
+        df = pd.DataFrame()
 
     if df.empty:
         st.error("No data available.")
     else:
-        # Clean index + flatten
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [col[0] for col in df.columns]
-
-        df.index = pd.to_datetime(df.index)
-        if getattr(df.index, "tz", None) is not None:
-            df.index = df.index.tz_convert(None)
-
-        df = df.sort_index()
         df = df.dropna(subset=["Close"])
 
         closes = df["Close"]
@@ -102,6 +107,104 @@ if st.button("Run Forecast"):
         })
 
         st.dataframe(forecast_df, use_container_width=True)
+
+        # Persist features so later runs and batch jobs only append new bars
+        store = get_feature_store()
+        features = store.update(ticker, closes)
+        X, y, _ = store.design_matrix(ticker)
+
+        with st.expander("Model features"):
+            st.write(f"Design matrix: {X.shape[0]} rows × {X.shape[1]} features (float32)")
+            st.dataframe(features.tail(20), use_container_width=True)
+
+# ============================
+# HISTORICAL ANALOGS
+# ============================
+st.write("---")
+st.subheader("Historical Analogs")
+st.markdown("Find the past windows most similar in shape to the latest bars of the ticker, and what happened next.")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    window = st.slider("Pattern length (bars)", 10, 120, 30)
+with col2:
+    analog_horizon = st.slider("Look-ahead (bars)", 5, 60, 20)
+with col3:
+    scope = st.selectbox("Search in", ["This ticker", "Watchlist", "Custom list"])
+
+custom_universe = ""
+if scope == "Custom list":
+    custom_universe = st.text_input("Tickers to search (comma separated)", "AAPL, MSFT, NVDA, AMZN, GOOGL")
+
+if st.button("Find Analogs"):
+    symbol = ticker.strip().upper()
+    if scope == "Watchlist":
+        universe = [e["ticker"] for e in st.session_state.get("watchlist") or load_watchlist()]
+    elif scope == "Custom list":
+        universe = [t.strip().upper() for t in custom_universe.split(",") if t.strip()]
+    else:
+        universe = []
+    universe = list(dict.fromkeys([symbol] + universe))
+
+    series = {}
+    with st.spinner(f"Loading {len(universe)} price histories..."):
+        for sym in universe:
+            try:
+                dates, values = load_price_array(sym)
+            except Exception:
+                continue
+            if len(values) > window + analog_horizon:
+                series[sym] = (dates, values)
+
+    if symbol not in series:
+        st.error("Not enough history for this ticker.")
+    else:
+        query = series[symbol][1][-window:]
+        matches = search_universe(query, series, k=10, horizon=analog_horizon, self_ticker=symbol)
+
+        if not matches:
+            st.info("No analogs found.")
+        else:
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=np.arange(-window + 1, 1),
+                y=query / query[-1],
+                mode="lines",
+                name=f"{symbol} (now)",
+                line=dict(width=3, color="black")
+            ))
+            for m in matches:
+                label = f"{m['ticker']} {pd.Timestamp(m['end']):%Y-%m-%d}"
+                fig.add_trace(go.Scatter(
+                    x=np.arange(-window + 1, analog_horizon + 1),
+                    y=np.r_[m["window"] / m["window"][-1], m["path"][1:]],
+                    mode="lines",
+                    name=label,
+                    opacity=0.6
+                ))
+            fig.add_vline(x=0, line_dash="dot")
+            fig.update_layout(
+                title=f"Top {len(matches)} analogs (normalized to the last bar)",
+                xaxis_title="Bars from pattern end",
+                hovermode="x unified",
+                height=500
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            forward = np.array([m["forward_return"] for m in matches])
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Median forward return", f"{np.median(forward):.2%}")
+            c2.metric("Share positive", f"{(forward > 0).mean():.0%}")
+            c3.metric("Range", f"{forward.min():.2%} to {forward.max():.2%}")
+
+            st.dataframe(pd.DataFrame([{
+                "Ticker": m["ticker"],
+                "Start": pd.Timestamp(m["start"]).date(),
+                "End": pd.Timestamp(m["end"]).date(),
+                "Distance": round(m["distance"], 3),
+                f"Return next {analog_horizon} bars": f"{m['forward_return']:.2%}",
+            } for m in matches]), use_container_width=True, hide_index=True)
+
 # ============================
 # FOOTER
 # ============================
@@ -4,8 +4,47 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 
+from services.http_client import yf_session
+from services.alignment import BASE_CURRENCIES, align_prices, get_currency, load_fx_rates, unconverted_columns
+
 st.title("Multi-Ticker Comparison")
 
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def cached_currency(ticker):
+    return get_currency(ticker)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_fx_rates(currencies, base, start, end):
+    return load_fx_rates(currencies, base, start, end)
+
+
+@st.cache_data(ttl=3600, show_spinner="Aligning markets...")
+def load_aligned(tickers, start, end, base, weekends, rebased):
+    """
+    (aligned prices in `base`, tickers dropped for lack of an FX rate).
+    """
+    data = yf.download(list(tickers), start=start, end=end, auto_adjust=True, progress=False, session=yf_session())
+    if data.empty or "Close" not in data:
+        return pd.DataFrame(), []
+    prices = data["Close"]
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame(tickers[0])
+
+    currencies = {t: cached_currency(t) for t in prices.columns}
+    fx_rates = cached_fx_rates(tuple(sorted(set(currencies.values()))), base, start, end)
+    aligned = align_prices(
+        prices,
+        currencies=currencies,
+        fx_rates=fx_rates,
+        base=base,
+        weekends=weekends,
+        rebase_to=100.0 if rebased else None,
+    )
+    return aligned, unconverted_columns(prices.columns, currencies, fx_rates, base)
+
+
 symbols = st.text_input("Tickers (comma separated)", "NVDA, AAPL, MSFT")
 
 # Time range selector
@@ -21,31 +60,44 @@ time_options = {
 
 selected_range = st.selectbox("Select Time Range", list(time_options.keys()))
 
+col1, col2, col3 = st.columns(3)
+with col1:
+    base = st.selectbox("Base currency", BASE_CURRENCIES)
+with col2:
+    rebased = st.checkbox("Rebase to 100", value=True)
+with col3:
+    weekends = st.checkbox("Include weekend (crypto) bars", value=False)
+
 if st.button("Compare"):
-    tickers = [s.strip().upper() for s in symbols.split(",")]
+    tickers = [s.strip().upper() for s in symbols.split(",") if s.strip()]
 
-    # Determine start date
+    # Determine start date (whole days so the cache key is stable within a day)
     end_date = datetime.now()
     days = time_options[selected_range]
 
     if days is None:  # MAX
         start_date = "1900-01-01"
     else:
-        start_date = end_date - timedelta(days=days)
+        start_date = (end_date - timedelta(days=days)).date()
+
+    # Download, as-of align across exchange calendars and convert currency
+    df, unconverted = load_aligned(tuple(tickers), str(start_date), str(end_date.date()), base, weekends, rebased)
 
-    # Download data
-    df = yf.download(tickers, start=start_date, end=end_date)["Close"]
+    if unconverted:
+        st.warning(f"No FX rate to {base} for {', '.join(unconverted)}; left out of the comparison.")
 
-    if isinstance(df, pd.Series):
-        df = df.to_frame()
+    if df.empty:
+        st.warning("No price data available for the selected tickers.")
+        st.stop()
 
-    st.write(f"Comparing from **{start_date}** to **{end_date.date()}**")
+    st.write(f"Comparing from **{start_date}** to **{end_date.date()}** in **{base}**")
 
     fig = px.line(
         df,
         x=df.index,
         y=df.columns,
-        title=f"{', '.join(tickers)} Price Comparison"
+        title=f"{', '.join(tickers)} Price Comparison",
+        labels={"value": f"Rebased to 100 ({base})" if rebased else f"Close ({base})"},
     )
     fig.update_layout(hovermode="x unified")
 
@@ -0,0 +1,162 @@
+import streamlit as st
+import yfinance as yf
+import pandas as pd
+import plotly.graph_objects as go
+
+from services.watchlist import load_watchlist, save_watchlist
+from services.http_client import yf_session
+from services.portfolio import (
+    portfolio_returns,
+    rolling_volatility,
+    drawdowns,
+    beta,
+    historical_var,
+    cholesky_factor,
+    monte_carlo_var,
+)
+
+st.set_page_config(page_title="Portfolio Analytics", layout="wide")
+
+st.title("Portfolio Analytics")
+
+BENCHMARK = "^GSPC"
+
+period_map = {
+    "1 Year": "1y",
+    "2 Years": "2y",
+    "5 Years": "5y",
+    "10 Years": "10y",
+    "20 Years": "20y",
+}
+
+
+# -----------------------------
+# CACHED DATA
+# -----------------------------
+@st.cache_data(ttl=3600, show_spinner="Loading prices...")
+def load_returns(tickers, period):
+    prices = yf.download(
+        list(tickers) + [BENCHMARK],
+        period=period,
+        interval="1d",
+        session=yf_session(),
+        auto_adjust=True,
+        progress=False,
+    )["Close"]
+
+    if isinstance(prices, pd.Series):
+        prices = prices.to_frame()
+
+    prices.index = pd.to_datetime(prices.index)
+    if getattr(prices.index, "tz", None) is not None:
+        prices.index = prices.index.tz_convert(None)
+
+    prices = prices.sort_index().astype("float32")
+    return prices.pct_change(fill_method=None).iloc[1:]
+
+
+@st.cache_data(show_spinner="Factorizing covariance...")
+def load_factor(tickers, period):
+    # Keyed on the universe, not the weights, so weight edits reuse it
+    returns = load_returns(tickers, period).drop(columns=[BENCHMARK], errors="ignore")
+    return cholesky_factor(returns.astype(float))
+
+
+# -----------------------------
+# WEIGHTS
+# -----------------------------
+if "watchlist" not in st.session_state:
+    st.session_state.watchlist = load_watchlist()
+
+if not st.session_state.watchlist:
+    st.info("Watchlist is empty. Add tickers on the main page first.")
+    st.stop()
+
+weights_df = pd.DataFrame(st.session_state.watchlist)
+if "weight" not in weights_df.columns:
+    weights_df["weight"] = 1.0
+weights_df["weight"] = weights_df["weight"].fillna(1.0)
+
+edited = st.data_editor(
+    weights_df[["ticker", "name", "weight"]],
+    disabled=["ticker", "name"],
+    use_container_width=True,
+    hide_index=True,
+    key="portfolio_weights",
+)
+
+if st.button("Save weights"):
+    st.session_state.watchlist = edited.to_dict("records")
+    save_watchlist(st.session_state.watchlist)
+    st.success("Weights saved to watchlist.")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    period = st.selectbox("History", list(period_map.keys()), index=2)
+with col2:
+    level = st.selectbox("Confidence level", [0.95, 0.99], format_func=lambda x: f"{x:.0%}")
+with col3:
+    vol_window = st.slider("Rolling window (days)", 10, 126, 21)
+
+# -----------------------------
+# METRICS
+# -----------------------------
+tickers = tuple(sorted(edited["ticker"].astype(str).str.upper().unique()))
+returns = load_returns(tickers, period_map[period])
+
+if returns.empty:
+    st.warning("No price data available for the watchlist.")
+    st.stop()
+
+bench = returns[BENCHMARK] if BENCHMARK in returns.columns else None
+assets = returns.drop(columns=[BENCHMARK], errors="ignore").reindex(columns=list(tickers))
+weights = edited.groupby(edited["ticker"].str.upper())["weight"].sum().reindex(assets.columns).fillna(0.0)
+
+port = portfolio_returns(assets, weights.to_numpy())
+vol = rolling_volatility(port, vol_window)
+dd = drawdowns(port)
+hist_var, hist_cvar = historical_var(port, level)
+
+columns, mu, chol = load_factor(tickers, period_map[period])
+mc_var, mc_cvar = monte_carlo_var(mu, chol, weights.reindex(columns).fillna(0.0).to_numpy(), level, seed=0)
+
+m1, m2, m3, m4, m5 = st.columns(5)
+m1.metric("Beta vs S&P 500", f"{beta(port, bench):.2f}" if bench is not None else "N/A")
+m2.metric("Historical VaR", f"{hist_var:.2%}")
+m3.metric("Historical CVaR", f"{hist_cvar:.2%}")
+m4.metric("Monte Carlo VaR", f"{mc_var:.2%}")
+m5.metric("Monte Carlo CVaR", f"{mc_cvar:.2%}")
+
+st.write("---")
+
+# -----------------------------
+# CHARTS
+# -----------------------------
+st.subheader("Cumulative Return")
+fig = go.Figure()
+fig.add_trace(go.Scatter(x=port.index, y=(1 + port).cumprod() - 1, mode="lines", name="Portfolio"))
+if bench is not None:
+    fig.add_trace(go.Scatter(x=bench.index, y=(1 + bench.fillna(0)).cumprod() - 1, mode="lines", name="S&P 500"))
+fig.update_layout(hovermode="x unified", height=400, yaxis_tickformat=".0%")
+st.plotly_chart(fig, use_container_width=True)
+
+col_left, col_right = st.columns(2)
+
+with col_left:
+    st.subheader("Rolling Volatility (annualized)")
+    fig_vol = go.Figure(go.Scatter(x=vol.index, y=vol, mode="lines", name="Volatility"))
+    fig_vol.update_layout(height=300, yaxis_tickformat=".0%")
+    st.plotly_chart(fig_vol, use_container_width=True)
+
+with col_right:
+    st.subheader("Drawdown")
+    fig_dd = go.Figure(go.Scatter(x=dd.index, y=dd, fill="tozeroy", mode="lines", name="Drawdown"))
+    fig_dd.update_layout(height=300, yaxis_tickformat=".0%")
+    st.plotly_chart(fig_dd, use_container_width=True)
+
+if bench is not None:
+    st.subheader(f"Rolling Beta vs S&P 500 ({vol_window}d)")
+    rolling_beta = beta(port, bench, vol_window)
+    fig_beta = go.Figure(go.Scatter(x=rolling_beta.index, y=rolling_beta, mode="lines", name="Beta"))
+    fig_beta.update_layout(height=300)
+    st.plotly_chart(fig_beta, use_container_width=True)
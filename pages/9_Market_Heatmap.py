@@ -0,0 +1,138 @@
+import time
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from services.bulk_fetch import TokenBucket, bulk_download, daily_snapshot
+from services.constituents import INDEX_CONSTITUENTS, get_constituents
+
+st.set_page_config(page_title="Market Heatmap", layout="wide")
+
+st.title("Market Heatmap")
+st.markdown("Daily change and volume of index constituents, sized by traded value.")
+
+QUOTE_TTL = 300
+
+
+@st.cache_data(ttl=86400, show_spinner="Loading constituents...")
+def load_constituents(index_name):
+    return pd.DataFrame(get_constituents(index_name))
+
+
+@st.cache_resource
+def get_rate_limiter():
+    # One bucket per server process so concurrent sessions share the request budget
+    return TokenBucket(rate=2.0, capacity=4)
+
+
+@st.cache_resource
+def get_quote_cache():
+    return {}
+
+
+def render_map(placeholder, members, snapshot, index_name, shown=0):
+    """
+    Draw the treemap into `placeholder` and return how many tiles it has.
+    Tiles are only ever added, so when the count equals `shown` (what is
+    already drawn) the chart would not change and is not redrawn.
+    """
+    data = members.merge(snapshot, on="symbol", how="inner")
+    data = data[data["volume"] > 0]
+    if data.empty or len(data) == shown:
+        return shown
+
+    data["traded_value"] = data["last"] * data["volume"]
+    data["index"] = index_name
+    fig = px.treemap(
+        data,
+        path=["index", "sector", "symbol"],
+        values="traded_value",
+        color="pct",
+        color_continuous_scale="RdYlGn",
+        color_continuous_midpoint=0,
+        range_color=(-3, 3),
+        hover_data={"name": True, "last": ":.2f", "pct": ":.2f", "volume": ":,.0f"},
+    )
+    fig.update_layout(height=700, margin=dict(l=10, r=10, t=30, b=10))
+    placeholder.plotly_chart(fig, use_container_width=True)
+    return len(data)
+
+
+index_name = st.selectbox("Index", list(INDEX_CONSTITUENTS.keys()))
+
+col1, col2 = st.columns(2)
+with col1:
+    chunk_size = st.slider("Symbols per request", 10, 100, 50, step=10)
+with col2:
+    max_workers = st.slider("Concurrent requests", 1, 8, 4)
+
+if st.button("Load Heatmap"):
+    try:
+        members = load_constituents(index_name)
+    except Exception as e:
+        st.error(f"Could not load constituents: {e}")
+        st.stop()
+
+    if members.empty:
+        st.warning("No constituents found for this index.")
+        st.stop()
+
+    symbols = members["symbol"].tolist()
+    quote_cache = get_quote_cache()
+    now = time.time()
+    fresh = [quote_cache[sym][1] for sym in symbols if sym in quote_cache and now - quote_cache[sym][0] < QUOTE_TTL]
+    missing = [sym for sym in symbols if sym not in quote_cache or now - quote_cache[sym][0] >= QUOTE_TTL]
+
+    placeholder = st.empty()
+    snapshots = [pd.DataFrame(fresh)] if fresh else []
+    failed = []
+    shown = 0
+    if snapshots:
+        shown = render_map(placeholder, members, pd.concat(snapshots, ignore_index=True), index_name)
+
+    n_chunks = -(-len(missing) // chunk_size)
+    progress = st.progress(0.0, text="Fetching quotes...")
+    batches = bulk_download(
+        missing,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+        bucket=get_rate_limiter(),
+        period="5d",
+        interval="1d",
+        auto_adjust=True,
+    )
+    for done, (chunk, df, error) in enumerate(batches, start=1):
+        if error is not None:
+            failed.extend(chunk)
+        else:
+            snap = daily_snapshot(df, chunk)
+            # Symbols the batch returned no usable closes for (all NaN) failed too
+            failed.extend(sorted(set(chunk) - set(snap["symbol"])))
+            for row in snap.to_dict("records"):
+                quote_cache[row["symbol"]] = (time.time(), row)
+            if not snap.empty:
+                snapshots.append(snap)
+                # Redraw with everything received so far instead of waiting for the slowest batch
+                shown = render_map(placeholder, members, pd.concat(snapshots, ignore_index=True), index_name, shown)
+        progress.progress(done / n_chunks, text=f"Fetched {done}/{n_chunks} batches")
+
+    progress.empty()
+
+    if not snapshots:
+        st.error("No quote data could be loaded.")
+    else:
+        snapshot = pd.concat(snapshots, ignore_index=True)
+        st.caption(f"{len(snapshot)} of {len(symbols)} constituents loaded.")
+        if failed:
+            st.warning(f"{len(failed)} symbols failed after retries: {', '.join(failed[:20])}")
+
+        st.subheader("Top Movers")
+        movers = members.merge(snapshot, on="symbol").sort_values("pct")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.markdown("**Gainers**")
+            st.dataframe(movers.tail(10).iloc[::-1], use_container_width=True, hide_index=True)
+        with c2:
+            st.markdown("**Losers**")
+            st.dataframe(movers.head(10), use_container_width=True, hide_index=True)
@@ -0,0 +1,349 @@
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+
+import pandas as pd
+
+from services.bar_store import load_bars
+from services.indicator import compute_rsi, compute_macd, compute_bollinger
+from services.shared_cache import file_lock
+
+ALERTS_FILE = "alerts.json"
+FIRED_FILE = "alerts_fired.json"
+
+# Fired alerts kept on disk, newest last
+MAX_FIRED = 1000
+
+ALERT_FIELDS = ["Close", "RSI", "MACD", "Histogram", "SMA20", "BB_upper", "BB_lower"]
+ALERT_OPS = ["above", "below"]
+
+
+def _load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+
+def _save_json(path, data):
+    try:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def make_rule(ticker, field, op, threshold):
+    return {
+        "id": uuid.uuid4().hex[:12],
+        "ticker": ticker.strip().upper(),
+        "field": field,
+        "op": op,
+        "threshold": float(threshold),
+        # Until its first evaluation, a rule also fires on the current level
+        "primed": False,
+    }
+
+
+def describe(rule):
+    return f"{rule['ticker']} {rule['field']} {rule['op']} {rule['threshold']:g}"
+
+
+def _bucket_key(rule):
+    return rule["ticker"], rule["field"], rule["op"]
+
+
+class AlertIndex:
+    """
+    Rules kept as sorted (threshold, rule_id) lists per (ticker, field, op),
+    so a value move only bisects to the thresholds it crossed. Rules not yet
+    evaluated are tracked per (ticker, field) as well.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = {}
+        self._index = {}
+        self._unprimed = {}
+        # Bulk load: fill the buckets, then sort each once
+        for rule in rules:
+            self._track(rule)
+            self._index.setdefault(_bucket_key(rule), []).append((rule["threshold"], rule["id"]))
+        for bucket in self._index.values():
+            bucket.sort()
+
+    def _track(self, rule):
+        self.rules[rule["id"]] = rule
+        if not rule.get("primed", True):
+            self._unprimed.setdefault((rule["ticker"], rule["field"]), set()).add(rule["id"])
+
+    def add(self, rule):
+        self._track(rule)
+        insort(self._index.setdefault(_bucket_key(rule), []), (rule["threshold"], rule["id"]))
+
+    def remove(self, rule_id):
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
+            return
+        self._unprimed.get((rule["ticker"], rule["field"]), set()).discard(rule_id)
+        bucket = self._index.get(_bucket_key(rule), [])
+        i = bisect_left(bucket, (rule["threshold"], rule_id))
+        if i < len(bucket) and bucket[i] == (rule["threshold"], rule_id):
+            del bucket[i]
+
+    def fields(self, ticker):
+        return sorted({f for (t, f, _), bucket in self._index.items() if t == ticker and bucket})
+
+    def tickers(self):
+        return sorted({t for (t, _, _), bucket in self._index.items() if bucket})
+
+    def unprimed(self, ticker, field):
+        return [self.rules[i] for i in self._unprimed.get((ticker, field), ())]
+
+    def prime(self, rule_ids):
+        for rule_id in rule_ids:
+            rule = self.rules.get(rule_id)
+            if rule is not None:
+                rule["primed"] = True
+                self._unprimed.get((rule["ticker"], rule["field"]), set()).discard(rule_id)
+
+    def crossed(self, ticker, field, prev, cur):
+        """
+        Rule ids whose threshold was crossed moving from `prev` to `cur`.
+        "above" fires for prev <= t < cur, "below" for cur < t <= prev.
+        """
+        if pd.isna(prev) or pd.isna(cur) or prev == cur:
+            return []
+        if cur > prev:
+            bucket = self._index.get((ticker, field, "above"), [])
+            lo = bisect_left(bucket, (prev, ""))
+            hi = bisect_left(bucket, (cur, ""))
+        else:
+            bucket = self._index.get((ticker, field, "below"), [])
+            lo = bisect_right(bucket, (cur, "\uffff"))
+            hi = bisect_right(bucket, (prev, "\uffff"))
+        return [rule_id for _, rule_id in bucket[lo:hi]]
+
+
+def indicator_frame(bars):
+    df = pd.DataFrame({"Close": bars["Close"]})
+    df["RSI"] = compute_rsi(df["Close"])
+    df = compute_macd(df)
+    df = compute_bollinger(df)
+    return df
+
+
+def _past(rule, value):
+    if pd.isna(value):
+        return False
+    return value > rule["threshold"] if rule["op"] == "above" else value < rule["threshold"]
+
+
+class AlertEngine:
+    """
+    Persisted rules and fired alerts with a background evaluator that checks
+    each new bar against the threshold index.
+
+    Several server processes may share the files: every write re-reads them
+    under a file lock and merges, and only the process holding the monitor
+    lock runs the background evaluator.
+    """
+
+    def __init__(self, rules_file=ALERTS_FILE, fired_file=FIRED_FILE):
+        self.rules_file = rules_file
+        self.fired_file = fired_file
+        self.index = AlertIndex()
+        self.fired = []
+        self._fired_keys = set()
+        self._stamps = (None, None)
+        self._last_bar = {}
+        self._pending_primes = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.monitoring = False
+        self.reload()
+
+    def _stamp(self, path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def reload(self):
+        """
+        Pick up rules and fired alerts written by other processes.
+        """
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        stamps = (self._stamp(self.rules_file), self._stamp(self.fired_file))
+        if stamps[0] != self._stamps[0]:
+            self.index = AlertIndex(_load_json(self.rules_file, []))
+        if stamps[1] != self._stamps[1]:
+            self.fired = _load_json(self.fired_file, [])
+            self._fired_keys = {(f["rule_id"], f["date"]) for f in self.fired}
+        self._stamps = stamps
+
+    def _update_rules(self, change, patch):
+        """
+        Read-modify-write under the file lock so rules added elsewhere
+        survive. If nobody else wrote since our last read, `patch` updates
+        only the touched buckets of the index; otherwise the file is re-read,
+        `change`d and indexed afresh.
+        """
+        with file_lock(f"{self.rules_file}.lock"):
+            if self._stamp(self.rules_file) == self._stamps[0]:
+                patch(self.index)
+                rules = list(self.index.rules.values())
+            else:
+                rules = change(_load_json(self.rules_file, []))
+                self.index = AlertIndex(rules)
+            _save_json(self.rules_file, rules)
+            self._stamps = (self._stamp(self.rules_file), self._stamps[1])
+
+    def add_rule(self, ticker, field, op, threshold):
+        rule = make_rule(ticker, field, op, threshold)
+        with self._lock:
+            self._update_rules(lambda rules: rules + [rule], lambda index: index.add(rule))
+        return rule
+
+    def remove_rule(self, rule_id):
+        with self._lock:
+            self._update_rules(
+                lambda rules: [r for r in rules if r["id"] != rule_id],
+                lambda index: index.remove(rule_id),
+            )
+
+    def _prime(self, rule_ids):
+        def change(rules):
+            for r in rules:
+                if r["id"] in rule_ids:
+                    r["primed"] = True
+            return rules
+        self._update_rules(change, lambda index: index.prime(rule_ids))
+
+    def flush(self):
+        """
+        Persist the rules primed by evaluate(persist=False) calls, in one write.
+        """
+        with self._lock:
+            if self._pending_primes:
+                self._prime(self._pending_primes)
+                self._pending_primes = set()
+
+    def _record(self, new):
+        """
+        Append fired alerts to the shared file, skipping any that another
+        process already recorded; returns the ones that were new.
+        """
+        with file_lock(f"{self.fired_file}.lock"):
+            fired = _load_json(self.fired_file, [])
+            seen = {(f["rule_id"], f["date"]) for f in fired}
+            new = [f for f in new if (f["rule_id"], f["date"]) not in seen]
+            if new:
+                fired = (fired + new)[-MAX_FIRED:]
+                _save_json(self.fired_file, fired)
+            self.fired = fired
+            self._fired_keys = seen | {(f["rule_id"], f["date"]) for f in new}
+            self._stamps = (self._stamps[0], self._stamp(self.fired_file))
+        return new
+
+    def evaluate(self, ticker, frame, persist=True):
+        """
+        Fire rules crossed between consecutive bars since the last evaluated one.
+        A rule's first evaluation also fires if the latest bar is already past
+        its threshold. Each (rule, bar date) fires at most once, across
+        restarts and processes. With persist=False, newly primed rules are
+        only written by the next flush().
+        """
+        if len(frame) < 2:
+            return []
+        last = self._last_bar.get(ticker)
+        # The last evaluated bar is re-checked since it may have been a partial session
+        start = max(1, frame.index.searchsorted(last)) if last is not None else len(frame) - 1
+
+        def alert(rule_id, date, value):
+            return {
+                "rule_id": rule_id,
+                "rule": describe(self.index.rules[rule_id]),
+                "date": date,
+                "value": float(value),
+                "fired_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+
+        new = []
+        primed = set()
+        with self._lock:
+            self._reload()
+            for field in self.index.fields(ticker):
+                if field not in frame.columns:
+                    continue
+                values = frame[field].to_numpy()
+                for i in range(start, len(frame)):
+                    date = frame.index[i].strftime("%Y-%m-%d")
+                    for rule_id in self.index.crossed(ticker, field, values[i - 1], values[i]):
+                        if (rule_id, date) not in self._fired_keys:
+                            self._fired_keys.add((rule_id, date))
+                            new.append(alert(rule_id, date, values[i]))
+                date = frame.index[-1].strftime("%Y-%m-%d")
+                for rule in self.index.unprimed(ticker, field):
+                    primed.add(rule["id"])
+                    if _past(rule, values[-1]) and (rule["id"], date) not in self._fired_keys:
+                        self._fired_keys.add((rule["id"], date))
+                        new.append(alert(rule["id"], date, values[-1]))
+            self._last_bar[ticker] = frame.index[-1]
+            if new:
+                new = self._record(new)
+            if primed:
+                # Primed in memory now, so the next tick doesn't re-check them
+                self.index.prime(primed)
+                self._pending_primes |= primed
+                if persist:
+                    self._prime(self._pending_primes)
+                    self._pending_primes = set()
+        return new
+
+    def check(self):
+        self.reload()
+        fired = []
+        for ticker in self.index.tickers():
+            try:
+                bars = load_bars(ticker, period="1y", adjust="split")
+            except Exception:
+                continue
+            if not bars.empty:
+                fired.extend(self.evaluate(ticker, indicator_frame(bars), persist=False))
+        self.flush()
+        return fired
+
+    def start(self, interval=300):
+        """
+        Start the background evaluator. Processes sharing the rules file
+        take turns on one monitor lock; the others keep retrying, so the
+        monitor moves on if its process exits.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def loop():
+            while True:
+                with file_lock(f"{self.rules_file}.monitor.lock", blocking=False) as acquired:
+                    self.monitoring = acquired
+                    while acquired:
+                        try:
+                            self.check()
+                        except Exception:
+                            pass
+                        time.sleep(interval)
+                time.sleep(interval)
+
+        self._thread = threading.Thread(target=loop, name="alert-monitor", daemon=True)
+        self._thread.start()
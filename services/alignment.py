@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from services.http_client import yf_session
+
+BASE_CURRENCIES = ["USD", "EUR", "GBP", "JPY", "CHF"]
+
+INDEX_CURRENCIES = {
+    "^GSPC": "USD",
+    "^IXIC": "USD",
+    "^DJI": "USD",
+    "^RUT": "USD",
+    "^VIX": "USD",
+    "^FTSE": "GBP",
+    "^GDAXI": "EUR",
+    "^FCHI": "EUR",
+    "^N225": "JPY",
+    "^HSI": "HKD",
+}
+
+SUFFIX_CURRENCIES = {
+    ".L": "GBp",
+    ".DE": "EUR",
+    ".F": "EUR",
+    ".PA": "EUR",
+    ".AS": "EUR",
+    ".MI": "EUR",
+    ".MC": "EUR",
+    ".SW": "CHF",
+    ".T": "JPY",
+    ".HK": "HKD",
+    ".TO": "CAD",
+    ".AX": "AUD",
+}
+
+# Quotes in minor units and the major currency they convert to
+MINOR_UNITS = {"GBp": ("GBP", 0.01), "GBX": ("GBP", 0.01), "ZAc": ("ZAR", 0.01), "ILA": ("ILS", 0.01)}
+
+# Longest gap an as-of join may bridge before a value counts as missing
+MAX_GAP = pd.Timedelta(days=7)
+
+
+def guess_currency(ticker):
+    ticker = ticker.upper()
+    if ticker in INDEX_CURRENCIES:
+        return INDEX_CURRENCIES[ticker]
+    if "-" in ticker and not ticker.startswith("^"):
+        quote = ticker.rsplit("-", 1)[1]
+        if len(quote) == 3:
+            return quote
+    for suffix, cur in SUFFIX_CURRENCIES.items():
+        if ticker.endswith(suffix.upper()):
+            return cur
+    return "USD"
+
+
+def get_currency(ticker):
+    try:
+        cur = yf.Ticker(ticker, session=yf_session()).fast_info.get("currency")
+        if cur:
+            return cur
+    except Exception:
+        pass
+    return guess_currency(ticker)
+
+
+def fx_ticker(cur, base):
+    return f"{cur}{base}=X"
+
+
+def load_fx_rates(currencies, base, start, end):
+    """
+    Daily closes of `base` per unit of each currency, keyed by currency.
+    """
+    needed = sorted({MINOR_UNITS.get(c, (c, 1))[0] for c in currencies} - {base})
+    if not needed:
+        return {}
+
+    data = yf.download(
+        [fx_ticker(c, base) for c in needed],
+        start=start,
+        end=end,
+        interval="1d",
+        session=yf_session(),
+        auto_adjust=True,
+        progress=False,
+    )
+    # A failed download comes back as an empty frame without a Close column
+    if data is None or data.empty or "Close" not in data:
+        return {}
+    raw = data["Close"]
+    if isinstance(raw, pd.Series):
+        raw = raw.to_frame(fx_ticker(needed[0], base))
+
+    return {c: raw[fx_ticker(c, base)].dropna() for c in needed if fx_ticker(c, base) in raw.columns}
+
+
+def trading_calendar(prices, weekends=False):
+    """
+    Union of every date on which at least one column traded.
+    Weekend dates (crypto only) are dropped unless `weekends` is set.
+    """
+    dates = prices.dropna(how="all").index
+    if not weekends:
+        dates = dates[dates.dayofweek < 5]
+    return dates
+
+
+def asof_align(prices, calendar, max_gap=MAX_GAP):
+    """
+    As-of join each column onto `calendar`: every date takes that column's
+    last observation at or before it, unless it is older than `max_gap`.
+    Each column is one searchsorted over its own trading dates.
+    """
+    cal = calendar.values
+    out = np.full((len(cal), prices.shape[1]), np.nan)
+
+    for j, col in enumerate(prices.columns):
+        s = prices[col].dropna()
+        if s.empty:
+            continue
+        dates = s.index.values
+        pos = np.searchsorted(dates, cal, side="right") - 1
+        valid = pos >= 0
+        if max_gap is not None:
+            valid &= (cal - dates[np.clip(pos, 0, None)]) <= max_gap.to_timedelta64()
+        out[valid, j] = s.to_numpy(dtype=float)[pos[valid]]
+
+    return pd.DataFrame(out, index=calendar, columns=prices.columns)
+
+
+def _major(currency):
+    return MINOR_UNITS.get(currency, (currency, 1))
+
+
+def unconverted_columns(columns, currencies, fx_rates, base):
+    """
+    Columns quoted in a currency other than `base` with no FX series to convert them.
+    """
+    out = []
+    for col in columns:
+        cur = _major(currencies.get(col, base))[0]
+        rate = fx_rates.get(cur)
+        if cur != base and (rate is None or rate.empty):
+            out.append(col)
+    return out
+
+
+def to_base_currency(prices, currencies, fx_rates, base):
+    """
+    Convert each column to `base` using as-of aligned FX closes.
+    Columns whose FX series is unavailable are dropped rather than left in
+    their own currency; unconverted_columns() names them.
+    """
+    missing = unconverted_columns(prices.columns, currencies, fx_rates, base)
+    out = prices.drop(columns=missing)
+    for col in out.columns:
+        cur, scale = _major(currencies.get(col, base))
+        if cur == base:
+            if scale != 1:
+                out[col] = out[col] * scale
+            continue
+        rate = fx_rates[cur]
+        aligned = asof_align(rate.to_frame("fx"), prices.index)["fx"]
+        out[col] = out[col] * aligned.to_numpy() * scale
+    return out
+
+
+def rebase(prices, value=100.0):
+    first = prices.bfill().iloc[0]
+    return prices / first * value
+
+
+def align_prices(prices, currencies=None, fx_rates=None, base=None, weekends=False, max_gap=MAX_GAP, rebase_to=None):
+    """
+    Calendar-aware close matrix: as-of joined onto the union trading calendar,
+    optionally converted to `base` and rebased so every column starts at `rebase_to`.
+    Columns that cannot be converted to `base` are dropped.
+    """
+    prices = prices.copy()
+    prices.index = pd.to_datetime(prices.index)
+    if getattr(prices.index, "tz", None) is not None:
+        prices.index = prices.index.tz_convert(None)
+    prices = prices.sort_index()
+
+    aligned = asof_align(prices, trading_calendar(prices, weekends), max_gap)
+    if base is not None:
+        aligned = to_base_currency(aligned, currencies or {}, fx_rates or {}, base)
+    if rebase_to is not None:
+        aligned = rebase(aligned, rebase_to)
+    return aligned
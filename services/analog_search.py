@@ -0,0 +1,112 @@
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def sliding_mean_std(x, m):
+    c = np.cumsum(np.r_[0.0, x])
+    c2 = np.cumsum(np.r_[0.0, x * x])
+    mean = (c[m:] - c[:-m]) / m
+    var = (c2[m:] - c2[:-m]) / m - mean ** 2
+    return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def distance_profile(query, x):
+    """
+    z-normalized Euclidean distance between `query` and every length-m
+    window of `x` (MASS): one FFT convolution plus sliding statistics,
+    O(n log n) instead of O(n * m).
+    """
+    m, n = len(query), len(x)
+    if n < m:
+        return np.empty(0)
+    std = query.std()
+    if std == 0:
+        return np.full(n - m + 1, np.inf)
+    q = (query - query.mean()) / std
+
+    size = 1 << (n + m - 1).bit_length()
+    dots = np.fft.irfft(np.fft.rfft(q[::-1], size) * np.fft.rfft(x, size), size)[m - 1:n]
+    _, sigma = sliding_mean_std(x, m)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = dots / (m * sigma)
+    dist = np.sqrt(np.maximum(2 * m * (1 - corr), 0.0))
+    dist[sigma == 0] = np.inf
+    return dist
+
+
+def top_matches(profile, k, exclusion):
+    """
+    Up to k best window offsets, each at least `exclusion` bars from the others.
+    """
+    prof = profile.copy()
+    out = []
+    for _ in range(k):
+        i = int(np.argmin(prof)) if len(prof) else 0
+        if not len(prof) or not np.isfinite(prof[i]):
+            break
+        out.append((float(prof[i]), i))
+        prof[max(0, i - exclusion):i + exclusion + 1] = np.inf
+    return out
+
+
+def search_series(query, ticker, dates, values, k, horizon, is_self=False):
+    """
+    Best analogs of `query` inside one price series, with what followed each.
+    Windows need `horizon` bars after them; on the query's own series the
+    windows overlapping the query are skipped.
+    """
+    m = len(query)
+    profile = distance_profile(query, values)
+    usable = len(values) - m - horizon + 1
+    if usable <= 0:
+        return []
+    profile = profile[:usable]
+    exclusion = max(1, m // 2)
+    if is_self:
+        profile = profile.copy()
+        profile[max(0, len(values) - 2 * m - exclusion):] = np.inf
+
+    results = []
+    for dist, i in top_matches(profile, k, exclusion):
+        end = i + m - 1
+        path = values[end:end + horizon + 1] / values[end]
+        results.append({
+            "ticker": ticker,
+            "start": dates[i],
+            "end": dates[end],
+            "distance": dist,
+            "forward_return": float(path[-1] - 1),
+            "path": path,
+            "window": values[i:end + 1],
+        })
+    return results
+
+
+def search_universe(query, series, k=10, horizon=20, self_ticker=None, max_workers=8):
+    """
+    Top-k analogs across {ticker: (dates, values)}. Tickers are searched in
+    parallel (the FFTs release the GIL) and merged through a bounded heap,
+    so memory stays at k results regardless of universe size.
+    """
+    query = np.asarray(query, dtype=float)
+    heap = []
+    counter = itertools.count()
+
+    def run(item):
+        ticker, (dates, values) = item
+        return search_series(query, ticker, dates, values, k, horizon, is_self=ticker == self_ticker)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for matches in pool.map(run, series.items()):
+            for match in matches:
+                entry = (-match["distance"], next(counter), match)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[0] > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+
+    return [entry[2] for entry in sorted(heap, key=lambda e: -e[0])]
@@ -0,0 +1,114 @@
+import os
+
+import pandas as pd
+import yfinance as yf
+
+from services.corporate_actions import adjusted_view, unadjust_splits
+from services.shared_cache import shared_cache
+from services.http_client import yf_session
+
+BAR_DIR = os.path.join(".cache", "bars")
+
+# Seconds between incremental refreshes of the same ticker
+REFRESH_SECONDS = 900
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+PERIOD_OFFSETS = {
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+    "20y": pd.DateOffset(years=20),
+}
+
+
+def _path(ticker):
+    return os.path.join(BAR_DIR, f"{ticker}.pkl")
+
+
+def _fetch(ticker, **kwargs):
+    hist = yf.Ticker(ticker, session=yf_session()).history(interval="1d", auto_adjust=False, actions=True, **kwargs)
+    if hist.empty:
+        return hist
+    hist = hist.reindex(columns=BAR_COLUMNS).fillna({"Dividends": 0.0, "Stock Splits": 0.0})
+    if getattr(hist.index, "tz", None) is not None:
+        # Keep the exchange-local trading date
+        hist.index = hist.index.tz_localize(None)
+    hist.index = hist.index.normalize()
+    # Each response is adjusted only for splits it contains, so undo them before storing
+    return unadjust_splits(hist[~hist.index.duplicated(keep="last")].sort_index())
+
+
+def read_bars(ticker):
+    path = _path(ticker)
+    return pd.read_pickle(path) if os.path.exists(path) else None
+
+
+def _write_bars(ticker, bars):
+    os.makedirs(BAR_DIR, exist_ok=True)
+    path = _path(ticker)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    bars.to_pickle(tmp)
+    os.replace(tmp, path)
+
+
+def _refresh(ticker):
+    stored = read_bars(ticker)
+    if stored is None or stored.empty:
+        bars = _fetch(ticker, period="max")
+    else:
+        # Refetch the last stored bar too, it may have been a partial session
+        try:
+            new = _fetch(ticker, start=stored.index[-1].strftime("%Y-%m-%d"))
+        except Exception:
+            # Offline or upstream down: keep serving what is stored
+            return stored
+        bars = pd.concat([stored[stored.index < new.index[0]], new]) if not new.empty else stored
+
+    if bars is not stored and not bars.empty:
+        _write_bars(ticker, bars)
+    return bars
+
+
+def refresh_bars(ticker, force=False):
+    """
+    Raw (unadjusted) daily bars for a ticker, fetched in full once and then
+    extended from the last stored date. Dividends and splits ride along as
+    columns, so adjustments never need another download. Within
+    REFRESH_SECONDS every server process reads the same shared-cache entry,
+    and only one of them performs the refresh.
+    """
+    ticker = ticker.upper().strip()
+    if force:
+        bars = _refresh(ticker)
+        shared_cache.set(f"bars:{ticker}", bars, REFRESH_SECONDS)
+        return bars
+    return shared_cache.get_or_compute(f"bars:{ticker}", REFRESH_SECONDS, lambda: _refresh(ticker))
+
+
+def load_bars(ticker, period=None, start=None, end=None, adjust="split"):
+    """
+    Daily OHLCV for a date range in the requested adjustment (raw, split or total),
+    sliced from the local store.
+    """
+    bars = refresh_bars(ticker)
+    if bars is None or bars.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+
+    # Adjust over the full history first: factors depend on actions after the window
+    view = adjusted_view(bars, adjust)
+    idx = view.index
+    lo, hi = 0, len(idx)
+    if period in PERIOD_OFFSETS:
+        lo = max(lo, idx.searchsorted(idx[-1] - PERIOD_OFFSETS[period], side="right"))
+    if start is not None:
+        lo = max(lo, idx.searchsorted(pd.Timestamp(start)))
+    if end is not None:
+        hi = min(hi, idx.searchsorted(pd.Timestamp(end)))
+    # Own copy so callers can add indicator columns in place
+    return view.iloc[lo:hi].copy()
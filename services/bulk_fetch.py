@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import yfinance as yf
+
+from services.http_client import yf_session
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second with bursts up to `capacity`.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _download_chunk(symbols, bucket, retries, backoff, **kwargs):
+    last_error = None
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        try:
+            df = yf.download(
+                symbols,
+                group_by="column",
+                threads=False,
+                progress=False,
+                session=yf_session(),
+                **kwargs,
+            )
+            if not df.empty:
+                return df
+            last_error = RuntimeError("empty response")
+        except Exception as e:
+            last_error = e
+
+        if attempt < retries:
+            # Full jitter keeps replicas and chunks from retrying in lockstep
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+    raise last_error
+
+
+def bulk_download(symbols, chunk_size=50, max_workers=4, bucket=None, retries=3, backoff=1.0, **kwargs):
+    """
+    Download many symbols as batched yf.download calls with bounded concurrency.
+    Yields (symbols, frame, error) per chunk in completion order, so callers can
+    render partial results while slower chunks are still in flight. Pass a shared
+    `bucket` to rate-limit across calls and sessions.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    bucket = bucket or TokenBucket(2.0)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_download_chunk, chunk, bucket, retries, backoff, **kwargs): chunk
+            for chunk in chunked(symbols, chunk_size)
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                yield chunk, future.result(), None
+            except Exception as e:
+                yield chunk, None, e
+
+
+def daily_snapshot(df, symbols):
+    """
+    Last close, daily percent change and last volume per symbol from a
+    yf.download frame covering `symbols`.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        close, volume = df["Close"], df["Volume"]
+    else:
+        # Single-symbol downloads come back with flat OHLCV columns
+        close = df[["Close"]].set_axis(symbols[:1], axis=1)
+        volume = df[["Volume"]].set_axis(symbols[:1], axis=1)
+
+    rows = []
+    for sym in close.columns:
+        c = close[sym].dropna()
+        if len(c) < 2:
+            continue
+        v = volume[sym].reindex(c.index)
+        rows.append({
+            "symbol": sym,
+            "last": float(c.iloc[-1]),
+            "pct": float((c.iloc[-1] / c.iloc[-2] - 1) * 100),
+            "volume": float(v.iloc[-1]) if pd.notna(v.iloc[-1]) else 0.0,
+        })
+    return pd.DataFrame(rows, columns=["symbol", "last", "pct", "volume"])
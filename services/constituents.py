@@ -0,0 +1,86 @@
+from bs4 import BeautifulSoup
+
+from services.http_client import http_get
+
+# Constituent pages change rarely; Wikipedia's own cache headers are short
+CONSTITUENTS_TTL = 86400
+
+INDEX_CONSTITUENTS = {
+    "S&P 500": {
+        "url": "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies",
+        "suffix": "",
+    },
+    "NASDAQ-100": {
+        "url": "https://en.wikipedia.org/wiki/Nasdaq-100",
+        "suffix": "",
+    },
+    "Dow Jones": {
+        "url": "https://en.wikipedia.org/wiki/Dow_Jones_Industrial_Average",
+        "suffix": "",
+    },
+    "DAX": {
+        "url": "https://en.wikipedia.org/wiki/DAX",
+        "suffix": ".DE",
+    },
+    "FTSE 100": {
+        "url": "https://en.wikipedia.org/wiki/FTSE_100_Index",
+        "suffix": ".L",
+    },
+}
+
+SYMBOL_HEADERS = ("symbol", "ticker", "epic")
+NAME_HEADERS = ("security", "company", "name")
+SECTOR_HEADERS = ("gics sector", "sector", "prime standard sector", "industry", "ftse industry classification benchmark sector")
+
+
+def _pick(headers, candidates):
+    for cand in candidates:
+        for i, h in enumerate(headers):
+            if h == cand:
+                return i
+    return None
+
+
+def _to_yahoo(symbol, suffix):
+    symbol = symbol.strip()
+    if suffix:
+        return symbol if symbol.endswith(suffix) else f"{symbol.replace('.', '-')}{suffix}"
+    # Yahoo uses dashes for share classes (BRK.B -> BRK-B)
+    return symbol.replace(".", "-")
+
+
+def get_constituents(index_name):
+    """
+    Constituent list for an index as dicts with symbol, name and sector,
+    scraped from the index's Wikipedia constituents table.
+    """
+    source = INDEX_CONSTITUENTS[index_name]
+    resp = http_get(source["url"], ttl=CONSTITUENTS_TTL)
+    resp.raise_for_status()
+    soup = BeautifulSoup(resp.text, "html.parser")
+
+    tables = soup.find_all("table", id="constituents") or soup.find_all("table", class_="wikitable")
+    for table in tables:
+        rows = table.find_all("tr")
+        if not rows:
+            continue
+        headers = [th.get_text(strip=True).lower() for th in rows[0].find_all(["th", "td"])]
+        sym_i = _pick(headers, SYMBOL_HEADERS)
+        if sym_i is None:
+            continue
+        name_i = _pick(headers, NAME_HEADERS)
+        sector_i = _pick(headers, SECTOR_HEADERS)
+
+        out = []
+        for row in rows[1:]:
+            cells = [c.get_text(strip=True) for c in row.find_all(["td", "th"])]
+            if len(cells) <= sym_i or not cells[sym_i]:
+                continue
+            out.append({
+                "symbol": _to_yahoo(cells[sym_i], source["suffix"]),
+                "name": cells[name_i] if name_i is not None and name_i < len(cells) else cells[sym_i],
+                "sector": cells[sector_i] if sector_i is not None and sector_i < len(cells) else "Other",
+            })
+        if out:
+            return out
+    return []
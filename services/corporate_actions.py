@@ -0,0 +1,80 @@
+import numpy as np
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+# "raw" = as traded, "split" = split-adjusted (auto_adjust=False),
+# "total" = split and dividend adjusted (auto_adjust=True)
+ADJUST_MODES = ("raw", "split", "total")
+
+
+def _product_after(events):
+    # out[i] = prod(events[i+1:]), the factor every event after bar i applies to it
+    rev = np.cumprod(events[::-1])[::-1]
+    return np.r_[rev[1:], 1.0]
+
+
+def split_factors(splits):
+    """
+    Cumulative split ratio after each bar, from a per-bar split column (0 = none).
+    """
+    s = np.asarray(splits, dtype=float)
+    return _product_after(np.where(s > 0, s, 1.0))
+
+
+def dividend_factors(close, dividends):
+    """
+    Cumulative dividend multiplier per bar, Yahoo-style: each ex-date scales
+    earlier bars by 1 - dividend / previous close. Inputs must be in the same
+    (raw or split-adjusted) units.
+    """
+    c = np.asarray(close, dtype=float)
+    d = np.nan_to_num(np.asarray(dividends, dtype=float))
+    events = np.ones(len(c))
+    prev = np.r_[np.nan, c[:-1]]
+    hit = (d > 0) & np.isfinite(prev) & (prev > 0)
+    events[hit] = 1.0 - d[hit] / prev[hit]
+    return _product_after(events)
+
+
+def unadjust_splits(bars):
+    """
+    Convert provider split-adjusted bars (prices, volume, dividends) back to as-traded values.
+    """
+    factor = split_factors(bars["Stock Splits"].to_numpy())
+    raw = bars.copy()
+    raw[PRICE_COLUMNS] = bars[PRICE_COLUMNS].to_numpy() * factor[:, None]
+    raw["Volume"] = bars["Volume"].to_numpy() / factor
+    raw["Dividends"] = bars["Dividends"].to_numpy() * factor
+    return raw
+
+
+def adjusted_view(raw, mode="split"):
+    """
+    Derive a split- or total-return-adjusted frame from raw bars and their
+    Dividends / Stock Splits columns. No network access involved.
+    """
+    if mode not in ADJUST_MODES:
+        raise ValueError(f"Unknown adjustment mode: {mode}")
+    if mode == "raw" or raw.empty:
+        return raw.copy()
+
+    factor = split_factors(raw["Stock Splits"].to_numpy())
+    price_scale = 1.0 / factor
+    if mode == "total":
+        price_scale = price_scale * dividend_factors(raw["Close"].to_numpy(), raw["Dividends"].to_numpy())
+
+    out = raw.copy()
+    out[PRICE_COLUMNS] = raw[PRICE_COLUMNS].to_numpy() * price_scale[:, None]
+    out["Volume"] = raw["Volume"].to_numpy() * factor
+    out["Dividends"] = raw["Dividends"].to_numpy() / factor
+    return out
+
+
+def dividends_series(bars):
+    d = bars["Dividends"]
+    return d[d > 0]
+
+
+def splits_series(bars):
+    s = bars["Stock Splits"]
+    return s[s > 0]
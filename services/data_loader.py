@@ -1,18 +1,21 @@
 import yfinance as yf
 import streamlit as st
-import feedparser
+
+from services.bar_store import load_bars
+from services.http_client import parse_feed, yf_session
+from services.shared_cache import shared_cache
+
 
 def load_yahoo_rss(ticker):
     url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}"
-    feed = feedparser.parse(url)
-    return feed.entries
+    return shared_cache.get_or_compute(f"rss:{url}", 600, lambda: parse_feed(url).entries)
 
 
 def load_data(ticker):
     ticker = ticker.upper().strip()
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period="5y")
+        stock = yf.Ticker(ticker, session=yf_session())
+        hist = load_bars(ticker, period="5y", adjust="total")
         if hist.empty:
             st.error(f"No data for {ticker}")
             return None, None
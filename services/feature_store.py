@@ -0,0 +1,195 @@
+import os
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from services.indicator import compute_rsi, compute_macd, compute_bollinger
+
+FEATURE_DIR = os.path.join(".cache", "features")
+
+VOL_WINDOW = 20
+# Closes needed ahead of the first new bar so every rolling window is full
+WARMUP = VOL_WINDOW + 1
+
+INDICATOR_FEATURES = [
+    "Volatility", "RSI", "MACD", "Signal", "Histogram", "SMA20", "BB_upper", "BB_lower"
+]
+
+
+def _clean_close(close):
+    close = close.dropna().astype(float)
+    close.index = pd.to_datetime(close.index)
+    if getattr(close.index, "tz", None) is not None:
+        close.index = close.index.tz_convert(None)
+    return close[~close.index.duplicated(keep="last")].sort_index()
+
+
+def _continue_ema(values, span, last):
+    # Seeding adjust=False ewm with the previous EMA continues the recursion exactly
+    seeded = pd.Series(np.r_[last, values.to_numpy()])
+    return seeded.ewm(span=span, adjust=False).mean().to_numpy()[1:]
+
+
+def build_features(close):
+    """
+    Full feature frame (log return, rolling volatility and indicators) for a close series.
+    """
+    df = pd.DataFrame({"Close": _clean_close(close)})
+    df["Return"] = np.log(df["Close"]).diff()
+    df["Volatility"] = df["Return"].rolling(VOL_WINDOW).std()
+    df["RSI"] = compute_rsi(df["Close"])
+    df = compute_macd(df)
+    df = compute_bollinger(df)
+    return df
+
+
+def _tail_matches(features, close):
+    """
+    Whether the stored closes before the last bar agree with the incoming
+    ones on every shared date (one vectorized comparison). A split or any
+    revised history shows up here as a mismatch; no overlap at all (a gap)
+    cannot be verified and counts as one too.
+    """
+    stored = features["Close"].iloc[:-1]
+    common = stored.index.intersection(close.index)
+    if common.empty:
+        return False
+    return np.allclose(stored.loc[common].to_numpy(), close.loc[common].to_numpy(), rtol=1e-6)
+
+
+def extend_features(features, close):
+    """
+    Bring stored features up to date with `close`.
+
+    The last stored bar may have been a partial session, so it is recomputed
+    along with any newer bars; only the warmup tail is touched and EMAs carry
+    on from the bar before it, so the result matches a full rebuild. When
+    the overlapping closes disagree (new split, revised bars) the frame is
+    rebuilt from `close`.
+    """
+    close = _clean_close(close)
+    if len(features) < 2 or not _tail_matches(features, close):
+        return build_features(close)
+
+    last_date = features.index[-1]
+    close = close[close.index >= last_date]
+    if close.empty or (
+        len(close) == 1 and close.index[0] == last_date and close.iloc[0] == features["Close"].iloc[-1]
+    ):
+        return features
+
+    base = features.iloc[:-1]
+    n_warm = min(WARMUP, len(base))
+    ext = pd.DataFrame({"Close": pd.concat([base["Close"].iloc[-n_warm:], close])})
+    ext["Return"] = np.log(ext["Close"]).diff()
+    ext["Volatility"] = ext["Return"].rolling(VOL_WINDOW).std()
+    ext["RSI"] = compute_rsi(ext["Close"])
+    ext = compute_bollinger(ext)
+    ext = ext.iloc[n_warm:].copy()
+
+    last = base.iloc[-1]
+    ext["EMA12"] = _continue_ema(ext["Close"], 12, last["EMA12"])
+    ext["EMA26"] = _continue_ema(ext["Close"], 26, last["EMA26"])
+    ext["MACD"] = ext["EMA12"] - ext["EMA26"]
+    ext["Signal"] = _continue_ema(ext["MACD"], 9, last["Signal"])
+    ext["Histogram"] = ext["MACD"] - ext["Signal"]
+
+    return pd.concat([base, ext[features.columns]])
+
+
+def lag_matrix(values, lags):
+    """
+    Read-only strided view whose row i is [x[i+lags-1], x[i+lags-2], ..., x[i]].
+    No data is copied.
+    """
+    return sliding_window_view(np.asarray(values), lags)[:, ::-1]
+
+
+def design_matrix(features, lags=5, columns=INDICATOR_FEATURES):
+    """
+    Contiguous float32 (X, y, dates) for next-bar return prediction.
+    X holds `lags` lagged returns followed by `columns` at each date;
+    rows with any missing value are dropped.
+    """
+    returns = features["Return"].to_numpy()
+    n = len(returns)
+    if n <= lags:
+        return np.empty((0, lags + len(columns)), dtype=np.float32), np.empty(0, dtype=np.float32), features.index[:0]
+
+    X = np.empty((n - lags, lags + len(columns)), dtype=np.float32)
+    X[:, :lags] = lag_matrix(returns, lags)[:-1]
+    X[:, lags:] = features[columns].to_numpy()[lags - 1:n - 1]
+    y = returns[lags:].astype(np.float32)
+
+    mask = np.isfinite(X).all(axis=1) & np.isfinite(y)
+    return X[mask], y[mask], features.index[lags - 1:n - 1][mask]
+
+
+class FeatureStore:
+    """
+    Per-ticker feature frames persisted under FEATURE_DIR, shared by the
+    forecasting page, batch jobs and model evaluation.
+    """
+
+    def __init__(self, root=FEATURE_DIR):
+        self.root = root
+        self._frames = {}
+        self._matrices = {}
+
+    def _path(self, ticker):
+        return os.path.join(self.root, f"{ticker}.pkl")
+
+    def get(self, ticker):
+        ticker = ticker.upper().strip()
+        path = self._path(ticker)
+        if not os.path.exists(path):
+            return None
+
+        mtime = os.path.getmtime(path)
+        cached = self._frames.get(ticker)
+        if cached is None or cached[0] != mtime:
+            # Another process may have appended bars since we last read
+            self._frames[ticker] = (mtime, pd.read_pickle(path))
+        return self._frames[ticker][1]
+
+    def update(self, ticker, close):
+        ticker = ticker.upper().strip()
+        stored = self.get(ticker)
+        close = _clean_close(close)
+        if close.empty:
+            return stored
+
+        if stored is None:
+            features = build_features(close)
+        elif close.index[0] < stored.index[0]:
+            # Longer history than stored: the incoming closes win wherever they overlap
+            features = build_features(close.combine_first(stored["Close"]) if _tail_matches(stored, close) else close)
+        else:
+            features = extend_features(stored, close)
+
+        if features is not stored:
+            self._save(ticker, features)
+        return features
+
+    def _save(self, ticker, features):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(ticker)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        features.to_pickle(tmp)
+        os.replace(tmp, path)
+        self._frames[ticker] = (os.path.getmtime(path), features)
+
+    def design_matrix(self, ticker, lags=5, columns=INDICATOR_FEATURES):
+        ticker = ticker.upper().strip()
+        features = self.get(ticker)
+        if features is None:
+            return None
+
+        key = (ticker, lags, tuple(columns))
+        # The file's mtime changes with every save, including same-length rewrites
+        stamp = self._frames[ticker][0]
+        cached = self._matrices.get(key)
+        if cached is None or cached[0] != stamp:
+            self._matrices[key] = (stamp, design_matrix(features, lags, list(columns)))
+        return self._matrices[key][1]
@@ -0,0 +1,411 @@
+import email.utils
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import feedparser
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:  # yfinance falls back to plain requests without curl_cffi
+    curl_requests = None
+
+HTTP_CACHE_DIR = os.path.join(".cache", "http")
+HTTP_CACHE_BYTES = int(os.environ.get("GMD_HTTP_CACHE_BYTES", 256 * 1024 * 1024))
+# Writes between size checks of the cache directory
+PRUNE_EVERY = 64
+
+# Serve cached responses (however stale) and never touch the network
+OFFLINE = os.environ.get("GMD_OFFLINE", "").lower() in ("1", "true", "yes")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0 Safari/537.36"
+
+# Concurrent requests per host; GMD_HOST_LIMITS="host=n,host=n" overrides
+DEFAULT_HOST_LIMIT = 8
+HOST_LIMITS = {
+    "query1.finance.yahoo.com": 4,
+    "query2.finance.yahoo.com": 4,
+    "feeds.finance.yahoo.com": 4,
+    "en.wikipedia.org": 2,
+}
+for _item in filter(None, os.environ.get("GMD_HOST_LIMITS", "").split(",")):
+    _host, _, _limit = _item.partition("=")
+    try:
+        if not _host.strip() or int(_limit) < 1:
+            raise ValueError
+    except ValueError:
+        # A typo in the environment must not take every page down at import
+        warnings.warn(f"Ignoring GMD_HOST_LIMITS entry {_item!r}: expected host=n with n >= 1")
+        continue
+    HOST_LIMITS[_host.strip()] = int(_limit)
+
+POOL_SIZE = 16
+
+HOP_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection")
+
+
+class HostLimiter:
+    """
+    A semaphore per host, sized from HOST_LIMITS.
+    """
+
+    def __init__(self, limits=HOST_LIMITS, default=DEFAULT_HOST_LIMIT):
+        self.limits = limits
+        self.default = default
+        self._sems = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url):
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = self._sems[host] = threading.BoundedSemaphore(self.limits.get(host, self.default))
+        with sem:
+            yield
+
+
+class HttpMetrics:
+    """
+    Counters for outbound traffic: connection reuse and cache effectiveness.
+    """
+
+    FIELDS = (
+        "requests", "network", "new_connections", "unidentified",
+        "cache_hits", "revalidated", "stale_served", "errors",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+        self._hosts = {}
+        self._seen = set()
+
+    def add(self, field, n=1):
+        with self._lock:
+            self._counts[field] += n
+
+    def network(self, url, connection=None):
+        """
+        Record a request that went to the network. `connection` identifies
+        the socket (server ip, local port); a new one counts as a new
+        connection. None means the socket could not be seen, and such
+        requests are left out of the reuse ratio.
+        """
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            self._counts["network"] += 1
+            self._hosts[host] = self._hosts.get(host, 0) + 1
+            if connection is None:
+                self._counts["unidentified"] += 1
+            elif connection not in self._seen:
+                self._seen.add(connection)
+                self._counts["new_connections"] += 1
+
+    def snapshot(self):
+        with self._lock:
+            out = dict(self._counts)
+            out["hosts"] = dict(self._hosts)
+        identified = out["network"] - out["unidentified"]
+        out["connection_reuse"] = 1 - out["new_connections"] / identified if identified else None
+        cached = out["cache_hits"] + out["revalidated"] + out["stale_served"]
+        out["cache_hit_ratio"] = cached / out["requests"] if out["requests"] else None
+        return out
+
+
+def _parse_cache_control(value):
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"')
+    return directives
+
+
+def _freshness(headers, now):
+    """
+    Seconds a response may be served without revalidation (RFC 9111, without
+    heuristics): max-age, else Expires - Date, else 0.
+    """
+    cc = _parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in cc:
+        return 0
+    if re.fullmatch(r"\d+", cc.get("max-age", "")):
+        return int(cc["max-age"])
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            date = email.utils.parsedate_to_datetime(headers.get("Date")).timestamp() if headers.get("Date") else now
+            return max(0, email.utils.parsedate_to_datetime(expires).timestamp() - date)
+        except (TypeError, ValueError):
+            return 0
+    return 0
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache keyed by URL. Stores bodies with their
+    validators (ETag, Last-Modified) so expired entries are revalidated with
+    a conditional request instead of refetched; no-store responses are skipped.
+    Past `max_bytes` the least recently used entries are removed.
+    """
+
+    def __init__(self, root=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, url):
+        return os.path.join(self.root, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".pkl")
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            # Touch for LRU pruning
+            os.utime(path)
+            return entry
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, url, response, ttl=None):
+        # Bodies are stored decoded, so drop the transfer headers that describe the wire form
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS}
+        if "no-store" in _parse_cache_control(headers.get("Cache-Control")):
+            return None
+        now = time.time()
+        entry = {
+            "url": url,
+            "status": response.status_code,
+            "headers": headers,
+            "body": response.content,
+            "stored": now,
+            "expires": now + (ttl if ttl is not None else _freshness(headers, now)),
+        }
+        self._write(url, entry)
+        return entry
+
+    def refresh(self, url, entry, response, ttl=None):
+        # 304: keep the body, take the new headers and freshness
+        now = time.time()
+        entry["headers"].update({k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS})
+        entry["stored"] = now
+        entry["expires"] = now + (ttl if ttl is not None else _freshness(entry["headers"], now))
+        self._write(url, entry)
+        return entry
+
+    def _write(self, url, entry):
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(url)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % PRUNE_EVERY == 1
+        if due:
+            self.prune()
+
+    def prune(self):
+        """
+        Remove least recently used entries until the cache fits `max_bytes`.
+        """
+        files = []
+        for name in os.listdir(self.root):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            files.append((info.st_mtime, info.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+def _from_entry(entry):
+    resp = requests.Response()
+    resp.status_code = entry["status"]
+    resp.headers = CaseInsensitiveDict(entry["headers"])
+    resp._content = entry["body"]
+    resp.url = entry["url"]
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
+def _full_url(url, params):
+    if not params:
+        return url
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+class HttpClient:
+    """
+    One pooled keep-alive session for plain HTTP fetches (feeds, pages),
+    with gzip, per-host concurrency limits and the on-disk response cache.
+    In offline mode, or when the network fails, cached entries are served
+    however stale they are.
+    """
+
+    def __init__(self, cache=None, limiter=None, metrics=None, offline=OFFLINE):
+        self.cache = cache or ResponseCache()
+        self.limiter = limiter or HostLimiter()
+        self.metrics = metrics or HttpMetrics()
+        self.offline = offline
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _send(self, url, headers, timeout):
+        with self.limiter.slot(url):
+            resp = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+            # The socket is only visible before the body is read
+            sock = getattr(getattr(resp.raw, "_connection", None), "sock", None)
+            connection = None
+            if sock is not None:
+                try:
+                    connection = (sock.getpeername(), sock.getsockname())
+                except OSError:
+                    pass
+            resp.content
+        self.metrics.network(url, connection)
+        return resp
+
+    def get(self, url, params=None, headers=None, timeout=15, ttl=None):
+        """
+        GET through the cache. `ttl` overrides the server's freshness
+        lifetime for endpoints that send no useful Cache-Control.
+        """
+        url = _full_url(url, params)
+        self.metrics.add("requests")
+        entry = self.cache.get(url)
+
+        if entry is not None and (self.offline or time.time() < entry["expires"]):
+            self.metrics.add("cache_hits" if not self.offline else "stale_served")
+            return _from_entry(entry)
+        if self.offline:
+            raise requests.ConnectionError(f"Offline and not cached: {url}")
+
+        headers = dict(headers or {})
+        if entry is not None:
+            if entry["headers"].get("ETag"):
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        try:
+            resp = self._send(url, headers, timeout)
+        except requests.RequestException:
+            self.metrics.add("errors")
+            if entry is None:
+                raise
+            self.metrics.add("stale_served")
+            return _from_entry(entry)
+
+        if resp.status_code == 304 and entry is not None:
+            self.metrics.add("revalidated")
+            return _from_entry(self.cache.refresh(url, entry, resp, ttl))
+        if resp.status_code == 200:
+            self.cache.set(url, resp, ttl)
+        elif entry is not None and resp.status_code >= 500:
+            self.metrics.add("stale_served")
+            return _from_entry(entry)
+        return resp
+
+
+client = HttpClient()
+
+
+def http_get(url, **kwargs):
+    return client.get(url, **kwargs)
+
+
+def parse_feed(url, ttl=None):
+    """
+    feedparser over a body fetched through the shared client, so feeds get
+    pooling, gzip and the response cache.
+    """
+    resp = client.get(url, ttl=ttl)
+    resp.raise_for_status()
+    return feedparser.parse(resp.content, response_headers=dict(resp.headers))
+
+
+class _LimitedSessionMixin:
+    """
+    Host limits and metrics for the session yfinance uses for every call.
+    Its responses are not cached here: yfinance rejects caching sessions,
+    and bar_store and shared_cache already cache what it returns.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        client.metrics.add("requests")
+        if client.offline:
+            raise requests.ConnectionError(f"Offline: {url}")
+        try:
+            with client.limiter.slot(url):
+                resp = super().request(method, url, *args, **kwargs)
+        except Exception:
+            client.metrics.add("errors")
+            raise
+        # curl_cffi reports the socket; the plain-requests fallback has
+        # released it by now, so its requests count as unidentified
+        connection = (getattr(resp, "primary_ip", None), getattr(resp, "local_port", None))
+        client.metrics.network(url, connection if connection[1] else None)
+        return resp
+
+
+if curl_requests is not None:
+    class _YfSession(_LimitedSessionMixin, curl_requests.Session):
+        pass
+else:
+    class _YfSession(_LimitedSessionMixin, requests.Session):
+        pass
+
+
+_yf_session = None
+_yf_lock = threading.Lock()
+
+
+def yf_session():
+    """
+    Process-wide session to pass as yfinance's `session=`: one connection
+    pool and cookie/crumb for every yf.download and yf.Ticker call.
+    """
+    global _yf_session
+    with _yf_lock:
+        if _yf_session is None:
+            if curl_requests is not None:
+                _yf_session = _YfSession(impersonate="chrome")
+            else:
+                _yf_session = _YfSession()
+                _yf_session.headers.update({"User-Agent": USER_AGENT})
+        return _yf_session
+
+
+def metrics():
+    return client.metrics.snapshot()
@@ -0,0 +1,290 @@
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+# Resident bytes across all sessions, and per session
+MAX_BYTES = int(os.environ.get("GMD_MEMORY_BUDGET", 1024 * 1024 * 1024))
+SESSION_BYTES = int(os.environ.get("GMD_SESSION_BUDGET", 256 * 1024 * 1024))
+
+TICKER_COLUMNS = ("ticker", "Ticker", "symbol", "Symbol")
+# Text columns with fewer distinct values than this share become categorical
+CATEGORY_SHARE = 0.5
+
+
+def _exact_float32(values):
+    narrow = values.astype(np.float32)
+    return np.array_equal(narrow.astype(values.dtype), values, equal_nan=True)
+
+
+def compact_frame(df):
+    """
+    Smaller copy of a frame holding exactly the same values: float columns
+    that float32 represents exactly, integers (and NaN-free integral
+    volume) in the narrowest integer type, and categorical ticker and other
+    low-cardinality text columns. Nothing is rounded, so the copy is safe
+    to display and export.
+    """
+    if isinstance(df, pd.Series):
+        return compact_frame(df.to_frame()).iloc[:, 0]
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_bool_dtype(s):
+            out[col] = s
+        elif col == "Volume" and pd.api.types.is_float_dtype(s) and s.notna().all() and (s % 1 == 0).all():
+            out[col] = pd.to_numeric(s.astype("int64"), downcast="integer")
+        elif pd.api.types.is_integer_dtype(s) and s.dtype.kind in "iu" and len(s):
+            out[col] = pd.to_numeric(s, downcast="integer" if s.dtype.kind == "i" else "unsigned")
+        elif pd.api.types.is_float_dtype(s) and s.dtype == np.float64 and _exact_float32(s.to_numpy()):
+            out[col] = s.astype("float32")
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            if col in TICKER_COLUMNS or s.nunique() < CATEGORY_SHARE * len(s):
+                out[col] = s.astype("category")
+            else:
+                out[col] = s
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def nbytes(obj):
+    """
+    Approximate memory held by an object, including pandas string data.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(nbytes(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def _compact(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return compact_frame(value)
+    return value
+
+
+class MemoryManager:
+    """
+    Bounded store for per-session data.
+
+    Entries are keyed by (session, name); frames stored with compact=True
+    are kept as compact_frame() copies. Past the session budget, that session's least recently used entries
+    are evicted; past the global budget, the least recently used across all
+    sessions go. An evicted entry keeps its loader, so the next get()
+    reloads it from the data layer instead of failing. Ended sessions are
+    dropped entirely, loaders included.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, session_bytes=SESSION_BYTES):
+        self.max_bytes = max_bytes
+        self.session_bytes = session_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._session_totals = {}
+        # Sessions reported ended, dropped on the next call that holds the lock
+        self._ended = deque()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def _account(self, session, size):
+        self._bytes += size
+        total = self._session_totals.get(session, 0) + size
+        if total:
+            self._session_totals[session] = total
+        else:
+            self._session_totals.pop(session, None)
+
+    def _evict(self, key):
+        entry = self._entries[key]
+        if entry["value"] is None:
+            return
+        self._account(key[0], -entry["nbytes"])
+        self.evictions += 1
+        if entry["loader"] is None:
+            del self._entries[key]
+        else:
+            entry["value"] = None
+            entry["nbytes"] = 0
+
+    def _drop(self, session, name=None):
+        for key in [k for k in self._entries if k[0] == session and (name is None or k[1] == name)]:
+            self._account(session, -self._entries.pop(key)["nbytes"])
+
+    def _reap(self):
+        while self._ended:
+            self._drop(self._ended.popleft())
+
+    def _enforce(self, keep):
+        session = keep[0]
+        over = self._session_totals.get(session, 0) - self.session_bytes
+        for key in list(self._entries):
+            if over <= 0:
+                break
+            if key[0] == session and key != keep and self._entries[key]["value"] is not None:
+                over -= self._entries[key]["nbytes"]
+                self._evict(key)
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if key != keep:
+                self._evict(key)
+
+    def put(self, session, name, value, loader=None, compact=False):
+        """
+        Store a value and return what was stored. With `compact`, frames are
+        stored as compact_frame() copies.
+        """
+        if compact:
+            value = _compact(value)
+        size = nbytes(value)
+        key = (session, name)
+        with self._lock:
+            self._reap()
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._account(session, -old["nbytes"])
+            self._entries[key] = {
+                "value": value,
+                "nbytes": size,
+                "loader": loader,
+                "compact": compact,
+                "loaded_at": time.time(),
+                "last_used": time.time(),
+            }
+            self._account(session, size)
+            self._enforce(key)
+        return value
+
+    def get(self, session, name, loader=None, ttl=None, compact=False):
+        """
+        Stored value, reloading it if it was evicted or is older than `ttl`
+        seconds. `loader` is used (and remembered) when the entry is missing.
+        """
+        key = (session, name)
+        now = time.time()
+        with self._lock:
+            self._reap()
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["last_used"] = now
+                self._entries.move_to_end(key)
+                fresh = ttl is None or now - entry["loaded_at"] < ttl
+                if entry["value"] is not None and fresh:
+                    self.hits += 1
+                    return entry["value"]
+                loader = entry["loader"]
+                compact = entry["compact"]
+                self.reloads += 1
+        if loader is None:
+            return None
+        return self.put(session, name, loader(), loader, compact)
+
+    def drop(self, session, name=None):
+        with self._lock:
+            self._drop(session, name)
+
+    def end_session(self, session):
+        """
+        Forget everything a session stored. Safe to call from a finalizer:
+        the drop itself happens on the next locked call.
+        """
+        self._ended.append(session)
+
+    def objects(self, session=None):
+        """
+        One row per entry: session, name, bytes, resident flag and idle seconds.
+        """
+        now = time.time()
+        with self._lock:
+            self._reap()
+            return [
+                {
+                    "session": s,
+                    "name": name,
+                    "bytes": e["nbytes"],
+                    "resident": e["value"] is not None,
+                    "idle_s": round(now - e["last_used"], 1),
+                }
+                for (s, name), e in self._entries.items()
+                if session is None or s == session
+            ]
+
+    def usage(self):
+        """
+        Resident bytes per session.
+        """
+        with self._lock:
+            self._reap()
+            return dict(self._session_totals)
+
+    def stats(self):
+        with self._lock:
+            self._reap()
+            return {
+                "entries": len(self._entries),
+                "sessions": len({s for s, _ in self._entries}),
+                "resident": sum(e["value"] is not None for e in self._entries.values()),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "session_bytes": self.session_bytes,
+                "hits": self.hits,
+                "reloads": self.reloads,
+                "evictions": self.evictions,
+            }
+
+
+memory = MemoryManager()
+
+
+class _SessionToken:
+    """
+    Kept in a session's st.session_state; when Streamlit discards the
+    session, the token is collected and the session's entries go with it.
+    """
+
+
+def _track(session):
+    import streamlit as st
+    if "_memory_token" not in st.session_state:
+        token = _SessionToken()
+        weakref.finalize(token, memory.end_session, session)
+        st.session_state["_memory_token"] = token
+
+
+def session_id():
+    """
+    Id of the Streamlit session running this script, or "default" outside one.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+    except ImportError:
+        ctx = None
+    return ctx.session_id if ctx is not None else "default"
+
+
+def session_get(name, loader, ttl=None, compact=False):
+    """
+    Per-session value for `name`, loaded (and reloadable) through `loader`.
+    """
+    session = session_id()
+    if session != "default":
+        _track(session)
+    return memory.get(session, name, loader, ttl, compact)
@@ -1,11 +1,21 @@
-import feedparser
+from services.http_client import parse_feed
+from services.shared_cache import shared_cache
+
+NEWS_TTL = 600
+
 
 def get_yahoo_news(ticker):
     """
     Fetch reliable Yahoo Finance RSS news for the given ticker.
+    Shared across server processes for NEWS_TTL seconds.
     """
+    ticker = ticker.upper().strip()
+    return shared_cache.get_or_compute(f"news:{ticker}", NEWS_TTL, lambda: _fetch_news(ticker))
+
+
+def _fetch_news(ticker):
     url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={ticker}"
-    feed = feedparser.parse(url)
+    feed = parse_feed(url)
 
     news_list = []
     for entry in feed.entries:
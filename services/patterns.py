@@ -0,0 +1,271 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from services.bar_store import load_bars
+from services.shared_cache import file_lock
+
+PATTERN_FILE = os.path.join(".cache", "patterns.pkl")
+
+# Bars before the current one a pattern may look at (hammer's trend check)
+CONTEXT = 4
+# Tickers per batched detection pass; bounds the temporaries of a full scan
+BATCH = 256
+
+# name -> (label, direction): 1 bullish, -1 bearish, 0 neutral
+PATTERNS = {
+    "doji": ("Doji", 0),
+    "hammer": ("Hammer", 1),
+    "bullish_engulfing": ("Bullish engulfing", 1),
+    "bearish_engulfing": ("Bearish engulfing", -1),
+    "morning_star": ("Morning star", 1),
+    "evening_star": ("Evening star", -1),
+    "inside_bar": ("Inside bar", 0),
+    "gap_up": ("Gap up", 1),
+    "gap_down": ("Gap down", -1),
+}
+
+OHLC = ["Open", "High", "Low", "Close"]
+
+
+def _shift(x, k):
+    out = np.full_like(x, np.nan)
+    out[..., k:] = x[..., :-k]
+    return out
+
+
+def detect(o, h, l, c):
+    """
+    Boolean hit arrays per pattern for OHLC arrays shaped (..., bars).
+
+    Every pattern is one vectorized expression over the arrays and their
+    shifted copies, so a 2-D (tickers x bars) block scans a whole universe
+    in one pass. Bars without enough history (NaN context) never match.
+    """
+    o, h, l, c = (np.asarray(a, dtype=float) for a in (o, h, l, c))
+    body = np.abs(c - o)
+    rng = h - l
+    upper = h - np.maximum(o, c)
+    lower = np.minimum(o, c) - l
+
+    o1, h1, l1, c1 = (_shift(a, 1) for a in (o, h, l, c))
+    o2, h2, l2, c2 = (_shift(a, 2) for a in (o, h, l, c))
+    c4 = _shift(c, 4)
+    body1 = np.abs(c1 - o1)
+    body2 = np.abs(c2 - o2)
+
+    with np.errstate(invalid="ignore"):
+        return {
+            "doji": (rng > 0) & (body <= 0.1 * rng),
+            "hammer": (body > 0) & (lower >= 2 * body) & (upper <= 0.5 * body) & (c1 < c4),
+            "bullish_engulfing": (c1 < o1) & (c > o) & (o <= c1) & (c >= o1) & (body > body1),
+            "bearish_engulfing": (c1 > o1) & (c < o) & (o >= c1) & (c <= o1) & (body > body1),
+            "morning_star": (
+                (c2 < o2) & (body2 >= 0.5 * (h2 - l2)) & (body1 <= 0.3 * body2)
+                & (np.maximum(o1, c1) < c2) & (c > o) & (c > (o2 + c2) / 2)
+            ),
+            "evening_star": (
+                (c2 > o2) & (body2 >= 0.5 * (h2 - l2)) & (body1 <= 0.3 * body2)
+                & (np.minimum(o1, c1) > c2) & (c < o) & (c < (o2 + c2) / 2)
+            ),
+            "inside_bar": (h < h1) & (l > l1),
+            "gap_up": l > h1,
+            "gap_down": h < l1,
+        }
+
+
+def detect_frame(df):
+    """
+    One boolean column per pattern for a single OHLC frame.
+    """
+    hits = detect(*(df[col].to_numpy() for col in OHLC))
+    return pd.DataFrame(hits, index=df.index)
+
+
+def pattern_hits(df, patterns=None):
+    """
+    Long-form hits (date, pattern, label, direction) for an OHLC frame.
+    """
+    flags = detect_frame(df)
+    if patterns is not None:
+        flags = flags[list(patterns)]
+    rows, cols = np.nonzero(flags.to_numpy())
+    names = flags.columns[cols]
+    return pd.DataFrame({
+        "date": df.index[rows],
+        "pattern": names,
+        "label": [PATTERNS[n][0] for n in names],
+        "direction": [PATTERNS[n][1] for n in names],
+    })
+
+
+class PatternCache:
+    """
+    Pattern detections per ticker, extended incrementally.
+
+    Each entry remembers its last bar and the OHLC of the trailing CONTEXT
+    bars. When new bars arrive only they (plus that context) are evaluated;
+    if the stored tail no longer matches (new split, revised bar) the ticker
+    is recomputed from scratch. Pending tickers are evaluated together as
+    right-aligned 2-D blocks of BATCH tickers. Server processes share the
+    file: each write re-reads it under a file lock and merges.
+    """
+
+    def __init__(self, path=PATTERN_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._stamp = None
+        self._reload()
+
+    def _mtime(self):
+        try:
+            return os.path.getmtime(self.path) if self.path else None
+        except OSError:
+            return None
+
+    def _reload(self):
+        # Pick up tickers another process evaluated since our last read
+        stamp = self._mtime()
+        if stamp is not None and stamp != self._stamp:
+            self._entries = pd.read_pickle(self.path)
+        self._stamp = stamp
+
+    def _start(self, ticker, bars):
+        """
+        (position to evaluate from, incremental?), or None when up to date.
+        """
+        entry = self._entries.get(ticker)
+        if entry is None:
+            return 0, False
+        pos = bars.index.searchsorted(entry["last"])
+        if pos >= len(bars) or bars.index[pos] != entry["last"]:
+            return 0, False
+        tail = bars[OHLC].to_numpy(dtype=float)[max(0, pos + 1 - CONTEXT):pos + 1]
+        if tail.shape != entry["tail"].shape or not np.allclose(tail, entry["tail"], equal_nan=True):
+            return 0, False
+        if pos == len(bars) - 1:
+            return None
+        return max(0, pos + 1 - CONTEXT), True
+
+    def _evaluate(self, batch):
+        """
+        Run detect() once over a block of (ticker, bars, start) and return
+        {ticker: hits frame} for the evaluated bars.
+        """
+        width = max(len(bars) - start for _, bars, start, _ in batch)
+        block = np.full((4, len(batch), width), np.nan)
+        for i, (_, bars, start, _) in enumerate(batch):
+            values = bars[OHLC].to_numpy(dtype=float)[start:]
+            block[:, i, width - len(values):] = values.T
+
+        flags = detect(*block)
+        names = np.array(list(flags))
+        # (tickers, patterns, bars): nonzero() comes back grouped by ticker
+        t, p, w = np.nonzero(np.stack([flags[n] for n in names], axis=1))
+        bounds = np.searchsorted(t, np.arange(len(batch) + 1))
+
+        out = {}
+        for i, (ticker, bars, start, _) in enumerate(batch):
+            lo, hi = bounds[i], bounds[i + 1]
+            order = np.argsort(w[lo:hi], kind="stable")
+            offset = width - (len(bars) - start)
+            out[ticker] = pd.DataFrame({
+                "date": bars.index[start + w[lo:hi][order] - offset],
+                "pattern": names[p[lo:hi][order]],
+            })
+        return out
+
+    def update(self, bars_by_ticker):
+        """
+        Bring detections up to date for {ticker: OHLC frame}; returns the
+        number of tickers that were evaluated.
+        """
+        with self._lock:
+            self._reload()
+            pending = []
+            for ticker, bars in bars_by_ticker.items():
+                if bars is None or bars.empty:
+                    continue
+                plan = self._start(ticker, bars)
+                if plan is not None:
+                    pending.append((ticker, bars) + plan)
+
+            updated = {}
+            for i in range(0, len(pending), BATCH):
+                batch = pending[i:i + BATCH]
+                found = self._evaluate(batch)
+                for ticker, bars, _, incremental in batch:
+                    fresh = found[ticker]
+                    if incremental:
+                        # Context bars were already scanned last time
+                        entry = self._entries[ticker]
+                        fresh = pd.concat([entry["hits"], fresh[fresh["date"] > entry["last"]]], ignore_index=True)
+                    updated[ticker] = {
+                        "last": bars.index[-1],
+                        "tail": bars[OHLC].to_numpy(dtype=float)[-CONTEXT:],
+                        "hits": fresh,
+                    }
+            self._entries.update(updated)
+
+            if updated and self.path:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with file_lock(f"{self.path}.lock"):
+                    # Re-read: another process may have written other tickers since
+                    self._stamp = None
+                    self._reload()
+                    self._entries.update(updated)
+                    tmp = f"{self.path}.{os.getpid()}.tmp"
+                    pd.to_pickle(self._entries, tmp)
+                    os.replace(tmp, self.path)
+                    self._stamp = self._mtime()
+        return len(pending)
+
+    def hits(self, ticker):
+        with self._lock:
+            self._reload()
+            entry = self._entries.get(ticker)
+            return entry["hits"].copy() if entry is not None else pd.DataFrame(columns=["date", "pattern"])
+
+    def recent(self, tickers, days=7):
+        """
+        Hits within `days` of each ticker's last bar, newest first.
+        """
+        frames = []
+        with self._lock:
+            self._reload()
+            for ticker in tickers:
+                entry = self._entries.get(ticker)
+                if entry is None:
+                    continue
+                h = entry["hits"]
+                h = h[h["date"] > entry["last"] - pd.Timedelta(days=days)]
+                if not h.empty:
+                    frames.append(h.assign(ticker=ticker))
+        if not frames:
+            return pd.DataFrame(columns=["ticker", "date", "pattern", "label", "direction"])
+        out = pd.concat(frames, ignore_index=True)
+        out["label"] = out["pattern"].map(lambda n: PATTERNS[n][0])
+        out["direction"] = out["pattern"].map(lambda n: PATTERNS[n][1])
+        return out[["ticker", "date", "pattern", "label", "direction"]].sort_values(
+            ["date", "ticker"], ascending=[False, True], ignore_index=True
+        )
+
+
+def scan_universe(tickers, cache, period="2y", max_workers=8):
+    """
+    Load split-adjusted bars for `tickers` in parallel and update `cache`;
+    returns the number of tickers that needed evaluating.
+    """
+    def load(ticker):
+        try:
+            return ticker, load_bars(ticker, period=period, adjust="split").dropna(subset=OHLC)
+        except Exception:
+            return ticker, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        bars = dict(pool.map(load, tickers))
+    return cache.update(bars)
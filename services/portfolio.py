@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def normalize_weights(weights):
+    w = np.asarray(weights, dtype=float)
+    w = np.where(np.isfinite(w) & (w > 0), w, 0.0)
+    total = w.sum()
+    if total == 0:
+        return np.full(len(w), 1.0 / len(w)) if len(w) else w
+    return w / total
+
+
+def portfolio_returns(returns, weights):
+    """
+    Daily portfolio returns from an aligned (dates x tickers) return matrix.
+    On each date the weights are renormalized over the names that have a
+    return, so a name not yet listed (or missing a day) is left out rather
+    than held as flat cash; dates with no returns at all are NaN.
+    """
+    r = returns.to_numpy(dtype=float)
+    present = np.isfinite(r)
+    w = normalize_weights(weights)
+    covered = present @ w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        port = np.where(present, r, 0.0) @ w / covered
+    port[covered == 0] = np.nan
+    return pd.Series(port, index=returns.index, name="Portfolio")
+
+
+def rolling_volatility(port, window=21):
+    return port.rolling(window).std() * np.sqrt(TRADING_DAYS)
+
+
+def drawdowns(port):
+    # Dates with no holdings (NaN) leave wealth unchanged
+    wealth = np.cumprod(1.0 + np.nan_to_num(port.to_numpy(), nan=0.0))
+    peak = np.maximum.accumulate(wealth)
+    return pd.Series(wealth / peak - 1.0, index=port.index, name="Drawdown")
+
+
+def beta(port, bench, window=None):
+    """
+    Beta of the portfolio against a benchmark return series; rolling when `window` is set.
+    """
+    joined = pd.concat([port, bench], axis=1, join="inner").dropna()
+    p, b = joined.iloc[:, 0], joined.iloc[:, 1]
+    if window is None:
+        var = b.var()
+        return float(p.cov(b) / var) if var else float("nan")
+    return p.rolling(window).cov(b) / b.rolling(window).var()
+
+
+def historical_var(port, level=0.95):
+    """
+    One-day historical VaR and CVaR as positive loss fractions.
+    """
+    r = port.dropna().to_numpy()
+    if r.size == 0:
+        return float("nan"), float("nan")
+    cutoff = np.quantile(r, 1.0 - level)
+    tail = r[r <= cutoff]
+    return float(-cutoff), float(-tail.mean())
+
+
+def cholesky_factor(returns):
+    """
+    Mean vector and lower Cholesky factor of the return covariance.
+    Independent of weights, so callers can cache it across weight changes.
+    """
+    r = returns.dropna(axis=1, how="all")
+    mu = r.mean().fillna(0.0).to_numpy()
+    cov = r.cov().fillna(0.0).to_numpy()
+    jitter = 1e-12 * max(np.trace(cov) / max(len(cov), 1), 1e-12)
+    for _ in range(8):
+        try:
+            return r.columns, mu, np.linalg.cholesky(cov + jitter * np.eye(len(cov)))
+        except np.linalg.LinAlgError:
+            # Short or collinear histories leave the covariance semi-definite
+            jitter *= 100
+    raise np.linalg.LinAlgError("Covariance matrix is not positive definite")
+
+
+def monte_carlo_var(mu, chol, weights, level=0.95, horizon=1, n_sims=10000, seed=None, chunk=2000):
+    """
+    VaR and CVaR from correlated normal returns simulated through the Cholesky factor.
+    Each draw is z @ (L.T @ w), so only one dot product per simulated path is needed
+    and memory stays at `chunk` x n_assets.
+    """
+    w = normalize_weights(weights)
+    drift = float(mu @ w) * horizon
+    loading = chol.T @ w
+    rng = np.random.default_rng(seed)
+
+    sims = np.empty(n_sims)
+    for start in range(0, n_sims, chunk):
+        stop = min(start + chunk, n_sims)
+        z = rng.standard_normal((stop - start, len(w)))
+        sims[start:stop] = z @ loading
+    sims = drift + sims * np.sqrt(horizon)
+
+    cutoff = np.quantile(sims, 1.0 - level)
+    return float(-cutoff), float(-sims[sims <= cutoff].mean())
@@ -0,0 +1,233 @@
+import os
+import random
+import threading
+import time
+
+import yfinance as yf
+
+from services.bar_store import read_bars
+from services.http_client import yf_session
+
+# "yahoo" streams from Yahoo's quote websocket (polling fast_info if that is
+# unavailable); "simulated" is a local random-walk feed for development and tests
+FEED = os.environ.get("GMD_QUOTE_FEED", "yahoo")
+
+POLL_SECONDS = 30
+SIM_INTERVAL = 0.5
+SIM_VOLATILITY = 0.0008
+
+
+class QuoteBoard:
+    """
+    Last price and daily change per symbol, fed by a push stream.
+
+    Every accepted tick bumps a global version and stamps the quote with it,
+    so readers can ask for only the quotes that changed since the version
+    they last rendered.
+    """
+
+    def __init__(self):
+        self._quotes = {}
+        self._version = 0
+        self._cond = threading.Condition()
+
+    @property
+    def version(self):
+        with self._cond:
+            return self._version
+
+    def apply(self, symbol, price, prev_close=None, ts=None):
+        with self._cond:
+            quote = self._quotes.get(symbol, {})
+            prev_close = prev_close or quote.get("prev_close")
+            if quote.get("last") == price and quote.get("prev_close") == prev_close:
+                return
+            self._version += 1
+            pct = (price - prev_close) / prev_close * 100 if prev_close else None
+            self._quotes[symbol] = {
+                "last": price,
+                "prev_close": prev_close,
+                "pct": pct,
+                "ts": ts or time.time(),
+                "version": self._version,
+            }
+            self._cond.notify_all()
+
+    def get(self, symbol):
+        with self._cond:
+            quote = self._quotes.get(symbol)
+            return dict(quote) if quote else None
+
+    def changes(self, since, symbols=None):
+        """
+        (current version, {symbol: quote}) for quotes updated after `since`.
+        """
+        with self._cond:
+            keys = self._quotes.keys() if symbols is None else [s for s in symbols if s in self._quotes]
+            return self._version, {
+                s: dict(self._quotes[s]) for s in keys if self._quotes[s]["version"] > since
+            }
+
+    def wait(self, since, timeout=None):
+        """
+        Block until the board moves past `since` (or timeout); returns the version.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._version > since, timeout)
+            return self._version
+
+
+class PollingFeed(threading.Thread):
+    """
+    Pushes last price and previous close from yfinance fast_info, which reads
+    a short intraday window instead of daily history.
+    """
+
+    def __init__(self, board, interval=POLL_SECONDS):
+        super().__init__(daemon=True)
+        self.board = board
+        self.interval = interval
+        self.symbols = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def subscribe(self, symbols):
+        with self._lock:
+            new = set(symbols) - self.symbols
+            self.symbols |= new
+        if new:
+            self._seed(sorted(new))
+        return new
+
+    def _seed(self, symbols):
+        # Quote new symbols now instead of at the next poll (or, when
+        # streaming, the next trade, which never comes for a closed market)
+        threading.Thread(target=self.poll, args=(symbols,), daemon=True).start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _subscribed(self):
+        with self._lock:
+            return sorted(self.symbols)
+
+    def poll(self, symbols=None):
+        for symbol in symbols or self._subscribed():
+            try:
+                info = yf.Ticker(symbol, session=yf_session()).fast_info
+                self.board.apply(symbol, float(info.last_price), float(info.previous_close))
+            except Exception:
+                continue
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.interval)
+
+
+class YahooFeed(PollingFeed):
+    """
+    Yahoo's streaming quote websocket. Falls back to polling when the
+    installed yfinance has no websocket client or the connection drops.
+    """
+
+    def __init__(self, board, interval=POLL_SECONDS):
+        super().__init__(board, interval)
+        self._ws = None
+
+    def subscribe(self, symbols):
+        new = super().subscribe(symbols)
+        if new and self._ws is not None:
+            self._ws.subscribe(sorted(new))
+        return new
+
+    def stop(self):
+        super().stop()
+        if self._ws is not None:
+            self._ws.close()
+
+    def _on_message(self, msg):
+        price = msg.get("price")
+        if price is None:
+            return
+        prev_close = msg.get("previous_close")
+        if not prev_close and msg.get("change") is not None:
+            prev_close = price - msg["change"]
+        ts = float(msg["time"]) / 1000 if msg.get("time") else None
+        self.board.apply(msg["id"], float(price), prev_close and float(prev_close), ts)
+
+    def run(self):
+        if hasattr(yf, "WebSocket"):
+            try:
+                self._ws = yf.WebSocket(verbose=False)
+                self._ws.subscribe(self._subscribed())
+                self._ws.listen(self._on_message)
+            except Exception:
+                pass
+            finally:
+                self._ws = None
+        super().run()
+
+
+class SimulatedFeed(PollingFeed):
+    """
+    Local random-walk ticks for development and tests. Starting prices come
+    from the bar store when a symbol has stored bars, else 100.
+    """
+
+    def __init__(self, board, interval=SIM_INTERVAL, volatility=SIM_VOLATILITY, seed=None):
+        super().__init__(board, interval)
+        self.volatility = volatility
+        self._rng = random.Random(seed)
+
+    def _start_price(self, symbol):
+        try:
+            bars = read_bars(symbol)
+            if bars is not None and len(bars) >= 2:
+                return float(bars["Close"].iloc[-1]), float(bars["Close"].iloc[-2])
+        except Exception:
+            pass
+        return 100.0, 100.0
+
+    def _seed(self, symbols):
+        for symbol in symbols:
+            last, prev_close = self._start_price(symbol)
+            self.board.apply(symbol, last, prev_close)
+
+    def poll(self, symbols=None):
+        # A random subset of symbols ticks each interval, like a real stream
+        for symbol in symbols or self._subscribed():
+            if self._rng.random() < 0.5:
+                continue
+            quote = self.board.get(symbol)
+            if quote is None:
+                continue
+            price = quote["last"] * (1 + self._rng.gauss(0, self.volatility))
+            self.board.apply(symbol, round(price, 4))
+
+
+FEEDS = {
+    "yahoo": YahooFeed,
+    "polling": PollingFeed,
+    "simulated": SimulatedFeed,
+}
+
+
+class QuoteStream:
+    """
+    A board plus the feed thread that pushes ticks into it.
+    """
+
+    def __init__(self, feed=FEED):
+        if feed not in FEEDS:
+            raise ValueError(f"Unknown quote feed: {feed}")
+        self.board = QuoteBoard()
+        self.feed = FEEDS[feed](self.board)
+        self.feed.start()
+
+    def subscribe(self, symbols):
+        self.feed.subscribe(symbols)
+        return self
+
+    def stop(self):
+        self.feed.stop()
@@ -0,0 +1,141 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from services.bar_store import load_bars
+from services.indicator import compute_rsi, compute_macd
+from services.shared_cache import file_lock
+from services.support_resistance import detect_levels
+
+STATS_FILE = os.path.join(".cache", "stats.pkl")
+
+# Bars used per ticker: enough for SMA200 plus a settled MACD
+LOOKBACK = 504
+LEVELS_LOOKBACK = 252
+
+RETURN_PERIODS = {"1D": 1, "1W": 5, "1M": 21, "3M": 63, "6M": 126, "1Y": 252}
+
+
+def _nearest_levels(close, last):
+    levels = detect_levels(close.tail(LEVELS_LOOKBACK))
+    supports = [lvl for kind, _, lvl in levels if kind == "support" and lvl < last]
+    resistances = [lvl for kind, _, lvl in levels if kind == "resistance" and lvl > last]
+    support = max(supports) if supports else np.nan
+    resistance = min(resistances) if resistances else np.nan
+    return support, resistance
+
+
+def bars_fingerprint(bars):
+    """
+    Hash of the closes the stats are computed from; changes with a new or
+    revised last bar and with a split that rescales the history.
+    """
+    close = bars["Close"].tail(LOOKBACK).astype(float).dropna()
+    h = hashlib.sha1(close.to_numpy().tobytes())
+    h.update(close.index.to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def ticker_stats(bars):
+    """
+    One snapshot row (latest price, period returns, 52-week range,
+    indicators and nearest support/resistance) from daily bars.
+    """
+    df = pd.DataFrame({"Close": bars["Close"].tail(LOOKBACK).astype(float)}).dropna()
+    close = df["Close"]
+    last = float(close.iloc[-1])
+
+    row = {"as_of": close.index[-1], "price": last, "fingerprint": bars_fingerprint(bars)}
+    values = close.to_numpy()
+    for name, n in RETURN_PERIODS.items():
+        row[f"ret_{name}"] = (last / values[-n - 1] - 1) * 100 if len(values) > n else np.nan
+
+    year = values[-252:]
+    row["high_52w"] = float(year.max())
+    row["low_52w"] = float(year.min())
+    row["from_high_pct"] = (last / row["high_52w"] - 1) * 100
+
+    df["RSI"] = compute_rsi(close)
+    df = compute_macd(df)
+    row["RSI"] = float(df["RSI"].iloc[-1])
+    row["MACD"] = float(df["MACD"].iloc[-1])
+    row["Signal"] = float(df["Signal"].iloc[-1])
+    for n in (20, 50, 200):
+        sma = close.rolling(n).mean().iloc[-1]
+        row[f"SMA{n}"] = float(sma)
+        row[f"above_SMA{n}"] = bool(last > sma) if pd.notna(sma) else False
+
+    support, resistance = _nearest_levels(close, last)
+    row["support"] = support
+    row["resistance"] = resistance
+    row["to_support_pct"] = (last / support - 1) * 100 if pd.notna(support) else np.nan
+    row["to_resistance_pct"] = (resistance / last - 1) * 100 if pd.notna(resistance) else np.nan
+    return row
+
+
+def load_stats(path=STATS_FILE):
+    return pd.read_pickle(path) if os.path.exists(path) else pd.DataFrame()
+
+
+def refresh_stats(tickers, path=STATS_FILE, max_workers=8):
+    """
+    Bring the stats table up to date for `tickers`. Rows whose closes have
+    not changed are kept as-is; only tickers with new or revised bars are
+    recomputed. The table is merged and written under a file lock so
+    concurrent refreshes don't drop each other's rows.
+    """
+    table = load_stats(path)
+    tickers = list(dict.fromkeys(t.upper().strip() for t in tickers if t.strip()))
+
+    def compute(ticker):
+        try:
+            bars = load_bars(ticker, period="2y", adjust="split")
+        except Exception:
+            return ticker, None
+        if bars.empty or len(bars) < 2:
+            return ticker, None
+        if "fingerprint" in table.columns and ticker in table.index:
+            if table.at[ticker, "fingerprint"] == bars_fingerprint(bars):
+                return ticker, None
+        return ticker, ticker_stats(bars)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        updates = {t: row for t, row in pool.map(compute, tickers) if row is not None}
+
+    if updates:
+        fresh = pd.DataFrame.from_dict(updates, orient="index")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with file_lock(f"{path}.lock"):
+            # Re-read: another process may have written rows since we started
+            table = load_stats(path)
+            table = pd.concat([table.drop(index=fresh.index, errors="ignore"), fresh])
+            table.index.name = "ticker"
+            tmp = f"{path}.{os.getpid()}.tmp"
+            table.to_pickle(tmp)
+            os.replace(tmp, path)
+    return table, len(updates)
+
+
+def screen(table, filters, sort_by=None, ascending=True):
+    """
+    Filter the stats table with (column, op, value) triples and sort it.
+    Every filter is one vectorized comparison over its column.
+    """
+    mask = np.ones(len(table), dtype=bool)
+    for column, op, value in filters:
+        col = table[column].to_numpy()
+        if op == "<":
+            mask &= col < value
+        elif op == ">":
+            mask &= col > value
+        elif op == "==":
+            mask &= col == value
+        else:
+            raise ValueError(f"Unknown operator: {op}")
+    out = table[mask]
+    if sort_by is not None:
+        out = out.sort_values(sort_by, ascending=ascending)
+    return out
@@ -0,0 +1,279 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import stat
+import tempfile
+import time
+import uuid
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, single-flight degrades to per-call
+    fcntl = None
+
+
+def _default_root():
+    # /dev/shm keeps entries in RAM and shared by every process on the host;
+    # one directory per user, since other users can write there too
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(base, f"global-market-dashboard-{uid}")
+
+
+def _private_dir(path):
+    """
+    Create `path` as a 0700 directory and check that it is ours: payloads
+    are unpickled, so a directory anyone else can write to must not be used.
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        info = os.lstat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if not hasattr(os, "getuid"):  # Windows: no owner/mode bits to check
+        return True
+    return info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+CACHE_ROOT = os.environ.get("GMD_SHARED_CACHE", _default_root())
+MAX_BYTES = int(os.environ.get("GMD_SHARED_CACHE_BYTES", 512 * 1024 * 1024))
+# Unreferenced payload files older than this are left over from failed writes
+ORPHAN_SECONDS = 600
+
+
+@contextmanager
+def file_lock(path, blocking=True):
+    """
+    Exclusive flock on `path` across processes; yields whether it was
+    acquired (always True when blocking, or where flock is unavailable).
+    """
+    with open(path, "a") as f:
+        if fcntl is None:
+            yield True
+            return
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SharedCache:
+    """
+    Host-level cache shared by all server processes.
+
+    Each key has a JSON meta file (expiry, payload kind, version) next to its
+    payload. Numeric frames with a DatetimeIndex are stored as .npy arrays and
+    read back memory-mapped, with their column dtypes restored from the meta;
+    everything else is pickled. Entries expire by TTL,
+    the least recently read are evicted past `max_bytes`, and get_or_compute
+    holds a per-key file lock so only one process refreshes a missing key.
+
+    The root must be a directory owned by this user with no group or other
+    access; otherwise the cache stays disabled and every call goes to
+    `compute`.
+    """
+
+    def __init__(self, root=CACHE_ROOT, max_bytes=MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = _private_dir(root)
+        if not self.enabled:
+            warnings.warn(f"Shared cache disabled: {root} is not a private directory owned by this user")
+
+    def _base(self, key):
+        return os.path.join(self.root, hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        base = self._base(key)
+        meta_path = f"{base}.meta.json"
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["expires"] < time.time():
+                return None
+
+            prefix = f"{base}.{meta['version']}"
+            if meta["kind"] == "frame":
+                values = np.load(f"{prefix}.values.npy", mmap_mode="r")
+                index = np.load(f"{prefix}.index.npy", mmap_mode="r")
+                value = pd.DataFrame(
+                    values,
+                    index=pd.DatetimeIndex(index.view("datetime64[ns]"), name=meta["index_name"]),
+                    columns=meta["columns"],
+                    copy=False,
+                )
+                # Values are stored as one float64 block; put integer columns back
+                dtypes = {c: t for c, t in zip(meta["columns"], meta.get("dtypes", [])) if t != "float64"}
+                if dtypes:
+                    value = value.astype(dtypes)
+            else:
+                with open(f"{prefix}.pkl", "rb") as f:
+                    value = pickle.load(f)
+            # Touch for LRU eviction
+            os.utime(meta_path)
+            return value
+        except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError):
+            # Missing, or replaced by another process mid-read
+            return None
+
+    def set(self, key, value, ttl):
+        if not self.enabled:
+            return
+        with file_lock(f"{self._base(key)}.lock"):
+            self._write(key, value, ttl)
+        self.evict()
+
+    def _write(self, key, value, ttl):
+        # Caller holds the key lock, so the meta it replaces is the one it read
+        base = self._base(key)
+        version = uuid.uuid4().hex[:8]
+        prefix = f"{base}.{version}"
+        meta = {"key": key, "expires": time.time() + ttl, "version": version}
+
+        if _is_array_frame(value):
+            np.save(f"{prefix}.values.npy", np.ascontiguousarray(value.to_numpy(dtype=np.float64)))
+            np.save(f"{prefix}.index.npy", value.index.to_numpy(dtype="datetime64[ns]").view(np.int64))
+            meta.update(
+                kind="frame",
+                columns=[str(c) for c in value.columns],
+                dtypes=[str(t) for t in value.dtypes],
+                index_name=value.index.name,
+            )
+        else:
+            with open(f"{prefix}.pkl", "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            meta.update(kind="pickle")
+
+        previous = _read_meta(f"{base}.meta.json")
+        tmp = f"{base}.meta.{version}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, f"{base}.meta.json")
+
+        # The replaced version goes once the meta points elsewhere; open memory
+        # maps stay valid, and payloads other writers are still producing are left alone
+        if previous is not None and previous.get("version") != version:
+            for path in _payload_files(base, previous):
+                _remove(path)
+
+    def get_or_compute(self, key, ttl, compute):
+        """
+        Cached value for `key`, computing it at most once across processes.
+        Other processes wait on the key lock and then read the fresh entry.
+        """
+        if not self.enabled:
+            return compute()
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with file_lock(f"{self._base(key)}.lock"):
+            value = self.get(key)
+            if value is not None:
+                return value
+            value = compute()
+            if value is not None:
+                self._write(key, value, ttl)
+        if value is not None:
+            self.evict()
+        return value
+
+    def evict(self):
+        if not self.enabled:
+            return
+        with file_lock(os.path.join(self.root, "evict.lock"), blocking=False) as acquired:
+            if not acquired:
+                return
+
+            now = time.time()
+            entries = []
+            total = 0
+            referenced = set()
+            for meta_path in glob.glob(os.path.join(self.root, "*.meta.json")):
+                base = meta_path[:-len(".meta.json")]
+                meta = _read_meta(meta_path)
+                if meta is None:
+                    continue
+                # Only the version the meta names: other files under this key
+                # may be a payload or tmp another process is writing right now
+                files = [meta_path] + _payload_files(base, meta)
+                referenced.update(files)
+                try:
+                    expires = meta["expires"]
+                    size = sum(os.path.getsize(p) for p in files)
+                    used = os.path.getmtime(meta_path)
+                except (OSError, ValueError, KeyError):
+                    continue
+                if expires < now:
+                    for p in files:
+                        _remove(p)
+                    continue
+                entries.append((used, size, files))
+                total += size
+
+            for _, size, files in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                for p in files:
+                    _remove(p)
+                total -= size
+
+            # Payloads and tmp files no meta points at (a writer that crashed
+            # before publishing); the age check spares ones being written now
+            for path in glob.glob(os.path.join(self.root, "*")):
+                if path in referenced or path.endswith((".meta.json", ".lock")):
+                    continue
+                try:
+                    if now - os.path.getmtime(path) > ORPHAN_SECONDS:
+                        _remove(path)
+                except OSError:
+                    pass
+
+
+def _is_array_frame(value):
+    return (
+        isinstance(value, pd.DataFrame)
+        and isinstance(value.index, pd.DatetimeIndex)
+        and value.index.tz is None
+        and all(pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in value.dtypes)
+    )
+
+
+def _read_meta(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _payload_files(base, meta):
+    prefix = f"{base}.{meta.get('version')}"
+    names = (".values.npy", ".index.npy") if meta.get("kind") == "frame" else (".pkl",)
+    return [prefix + name for name in names if os.path.exists(prefix + name)]
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+shared_cache = SharedCache()
@@ -0,0 +1,116 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+IO_WORKERS = 8
+CPU_WORKERS = max(1, min(4, multiprocessing.cpu_count() - 1))
+
+_process_pool = None
+_process_lock = threading.Lock()
+
+
+def get_process_pool():
+    # Shared for the life of the server; spawning workers per page would cost more than the work
+    global _process_pool
+    with _process_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(CPU_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _process_pool
+
+
+class TaskError(Exception):
+    pass
+
+
+class TaskGraph:
+    """
+    Small dependency-aware executor for assembling page data.
+
+    Each task receives the results of its dependencies as positional
+    arguments, in the order they were declared. "io" tasks run on a thread
+    pool, "cpu" tasks on a shared process pool (so their function and
+    arguments must be picklable). A task starts as soon as all its
+    dependencies have finished; failed or timed-out tasks fail their
+    dependents instead of blocking them.
+    """
+
+    def __init__(self, io_workers=IO_WORKERS):
+        self.io_workers = io_workers
+        self._tasks = {}
+
+    def add(self, name, fn, deps=(), kind="io", timeout=None):
+        if kind not in ("io", "cpu"):
+            raise ValueError(f"Unknown task kind: {kind}")
+        for dep in deps:
+            if dep not in self._tasks:
+                raise ValueError(f"Task {name} depends on unknown task {dep}")
+        self._tasks[name] = {"fn": fn, "deps": tuple(deps), "kind": kind, "timeout": timeout}
+        return self
+
+    def run(self):
+        """
+        Execute the graph, yielding (name, result, error) as each task
+        finishes so callers can render sections progressively.
+        """
+        results = {}
+        pending = dict(self._tasks)
+        running = {}
+
+        io_pool = ThreadPoolExecutor(self.io_workers)
+
+        def submit_ready():
+            for name, task in list(pending.items()):
+                if not all(dep in results for dep in task["deps"]):
+                    continue
+                del pending[name]
+                failed = [dep for dep in task["deps"] if results[dep][1] is not None]
+                if failed:
+                    yield name, None, TaskError(f"dependency failed: {', '.join(failed)}")
+                    continue
+                pool = io_pool if task["kind"] == "io" else get_process_pool()
+                args = [results[dep][0] for dep in task["deps"]]
+                deadline = time.monotonic() + task["timeout"] if task["timeout"] else None
+                running[pool.submit(task["fn"], *args)] = (name, deadline)
+
+        def finish(name, result, error):
+            results[name] = (result, error)
+            return name, result, error
+
+        try:
+            while pending or running:
+                skipped = list(submit_ready())
+                for name, result, error in skipped:
+                    yield finish(name, result, error)
+                if skipped:
+                    continue
+                if not running:
+                    break
+
+                deadlines = [d for _, d in running.values() if d is not None]
+                wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name, _ = running.pop(future)
+                    try:
+                        yield finish(name, future.result(), None)
+                    except Exception as e:
+                        yield finish(name, None, e)
+
+                now = time.monotonic()
+                for future, (name, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline and not future.done():
+                        # Abandon the result; the worker finishes in the background
+                        future.cancel()
+                        del running[future]
+                        yield finish(name, None, TimeoutError(f"{name} timed out"))
+        finally:
+            # Don't hold the page on threads abandoned after a timeout
+            io_pool.shutdown(wait=False, cancel_futures=True)
+
+    def results(self):
+        """
+        Run to completion and return {name: (result, error)}.
+        """
+        return {name: (result, error) for name, result, error in self.run()}
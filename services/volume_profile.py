@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from components.figure_cache import fingerprint
+
+# Profiles kept for recently charted frames
+MAX_PROFILES = 32
+# Sorted-price prefix arrays kept per profile (one per anchor)
+MAX_ANCHORS = 8
+
+VALUE_AREA = 0.70
+
+
+class VolumeProfile:
+    """
+    Prefix arrays over a bar frame for anchored VWAP and volume-by-price.
+
+    Cumulative price*volume and volume make any anchored VWAP an O(n)
+    subtraction. For each anchor, typical prices are sorted once with their
+    cumulative volume, so a histogram for any bin count is a searchsorted
+    over the bin edges, O(bins log n).
+    """
+
+    def __init__(self, df):
+        self.index = df.index
+        self.price = ((df["High"] + df["Low"] + df["Close"]) / 3).to_numpy(dtype=float)
+        self.volume = np.nan_to_num(df["Volume"].to_numpy(dtype=float))
+        valid = np.isfinite(self.price)
+        self.price = np.where(valid, self.price, 0.0)
+        self.volume = np.where(valid, self.volume, 0.0)
+        self._cum_pv = np.r_[0.0, np.cumsum(self.price * self.volume)]
+        self._cum_v = np.r_[0.0, np.cumsum(self.volume)]
+        self._sorted = OrderedDict()
+        self._lock = threading.Lock()
+
+    def anchor_position(self, anchor=None):
+        if anchor is None:
+            return 0
+        return int(min(self.index.searchsorted(pd.Timestamp(anchor)), len(self.index) - 1))
+
+    def vwap(self, anchor=None):
+        a = self.anchor_position(anchor)
+        pv = self._cum_pv[a + 1:] - self._cum_pv[a]
+        v = self._cum_v[a + 1:] - self._cum_v[a]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return pd.Series(pv / v, index=self.index[a:], name="VWAP")
+
+    def _sorted_prefix(self, a):
+        with self._lock:
+            cached = self._sorted.get(a)
+            if cached is not None:
+                self._sorted.move_to_end(a)
+                return cached
+
+        price, volume = self.price[a:], self.volume[a:]
+        keep = volume > 0
+        order = np.argsort(price[keep], kind="stable")
+        prices = price[keep][order]
+        cum_volume = np.r_[0.0, np.cumsum(volume[keep][order])]
+
+        with self._lock:
+            self._sorted[a] = (prices, cum_volume)
+            while len(self._sorted) > MAX_ANCHORS:
+                self._sorted.popitem(last=False)
+        return prices, cum_volume
+
+    def profile(self, anchor=None, bins=40):
+        """
+        Bin edges and traded volume per price bin from the anchor onward.
+        """
+        prices, cum_volume = self._sorted_prefix(self.anchor_position(anchor))
+        if len(prices) == 0:
+            return np.empty(0), np.empty(0)
+        lo, hi = prices[0], prices[-1]
+        if hi == lo:
+            hi = lo + 1e-9
+        edges = np.linspace(lo, hi, bins + 1)
+        pos = np.searchsorted(prices, edges, side="left")
+        pos[-1] = len(prices)
+        return edges, np.diff(cum_volume[pos])
+
+
+def value_area(edges, volumes, share=VALUE_AREA):
+    """
+    Point of control and the value area around it: starting at the busiest
+    bin, add whichever neighbour has more volume until `share` is covered.
+    Returns (poc, value_area_low, value_area_high) as prices.
+    """
+    if len(volumes) == 0 or volumes.sum() == 0:
+        return np.nan, np.nan, np.nan
+    centers = (edges[:-1] + edges[1:]) / 2
+    poc = int(np.argmax(volumes))
+    lo = hi = poc
+    covered = volumes[poc]
+    target = share * volumes.sum()
+    while covered < target and (lo > 0 or hi < len(volumes) - 1):
+        below = volumes[lo - 1] if lo > 0 else -1
+        above = volumes[hi + 1] if hi < len(volumes) - 1 else -1
+        if above >= below:
+            hi += 1
+            covered += volumes[hi]
+        else:
+            lo -= 1
+            covered += volumes[lo]
+    return float(centers[poc]), float(edges[lo]), float(edges[hi + 1])
+
+
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+PROFILE_COLUMNS = ["High", "Low", "Close", "Volume"]
+
+
+def get_profile(df):
+    """
+    Cached VolumeProfile for a frame, keyed by its content.
+    """
+    key = fingerprint(df, PROFILE_COLUMNS)
+    with _profiles_lock:
+        vp = _profiles.get(key)
+        if vp is not None:
+            _profiles.move_to_end(key)
+            return vp
+
+    vp = VolumeProfile(df)
+    with _profiles_lock:
+        _profiles[key] = vp
+        while len(_profiles) > MAX_PROFILES:
+            _profiles.popitem(last=False)
+    return vp
@@ -0,0 +1,22 @@
+import json
+import os
+
+WATCHLIST_FILE = "watchlist.json"
+
+
+def load_watchlist():
+    if not os.path.exists(WATCHLIST_FILE):
+        return []
+    try:
+        with open(WATCHLIST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return []
+
+
+def save_watchlist(watchlist):
+    try:
+        with open(WATCHLIST_FILE, "w", encoding="utf-8") as f:
+            json.dump(watchlist, f, indent=2)
+    except Exception:
+        pass